@@ -1,18 +1,24 @@
+import time
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import FileResponse
 from sqlmodel import Session, select, func
 from pydantic import BaseModel
 
-from app.database import get_session
+from app.database import get_session, get_pool_stats
 from app.models.user import User, UserRole
 from app.models.product import Product
 from app.models.category import Category
-from app.models.order import Order, OrderStatus, OrderItem
-from app.core.security import get_current_admin_user, get_current_staff_user
+from app.models.order import Order, OrderStatus
+from app.models.sales_rollup import DailyOrderSales, DailyProductSales, DailyCategorySales
+from app.core.security import get_current_admin_user, get_current_staff_user, password_pool
+from app.core.translation import TranslationService
+from app.core.profiling import ProfiledRoute, profile_store
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Response models
 class DashboardStats(BaseModel):
@@ -32,125 +38,154 @@ class SalesReport(BaseModel):
     data: List[Dict[str, Any]]
     total_sales: float
 
+@contextmanager
+def _timed(timings: Dict[str, float], section: str):
+    """Record how long a block took, in milliseconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[section] = (time.perf_counter() - started) * 1000
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    """Format section timings as a Server-Timing header value"""
+    return ", ".join(f"{section};dur={duration:.2f}" for section, duration in timings.items())
+
 @router.get("/dashboard", response_model=DashboardStats)
 def get_dashboard_stats(
+    response: Response,
+    lang: str = Query("en", description="Language for product and category names (en, fr, ar)"),
     current_user: User = Depends(get_current_staff_user),
     session: Session = Depends(get_session),
 ) -> Any:
     """
     Get dashboard statistics (staff only).
-    """
-    # Calculate statistics
-    total_users = session.exec(select(func.count()).select_from(User)).first()
-    total_products = session.exec(select(func.count()).select_from(Product)).first()
-    total_categories = session.exec(select(func.count()).select_from(Category)).first()
-    total_orders = session.exec(select(func.count()).select_from(Order)).first()
-    
-    # Calculate total revenue
-    total_revenue = session.exec(
-        select(func.sum(Order.total_amount)).where(Order.status != OrderStatus.CANCELLED)
-    ).first() or 0.0
-    
-    # Count pending orders
-    pending_orders = session.exec(
-        select(func.count()).select_from(Order).where(Order.status == OrderStatus.PENDING)
-    ).first()
-    
-    # Count low stock products (less than 10 items)
-    low_stock_products = session.exec(
-        select(func.count()).select_from(Product).where(
-            Product.stock_quantity < 10,
-            Product.is_active == True
-        )
-    ).first()
     
-    # The rest of your function...
+    Time spent on each section is reported in the Server-Timing header.
+    """
+    timings: Dict[str, float] = {}
     
-    # Get top selling products
-    top_products_query = select(
-        OrderItem.product_id,
-        OrderItem.product_name,
-        func.sum(OrderItem.quantity).label("total_quantity"),
-        func.sum(OrderItem.quantity * OrderItem.unit_price).label("total_sales")
-    ).join(Order).where(
-        Order.status != OrderStatus.CANCELLED
-    ).group_by(
-        OrderItem.product_id, 
-        OrderItem.product_name  # Added product_name here
-    ).order_by(
-        func.sum(OrderItem.quantity).desc()
-    ).limit(5)
-
+    product_name = TranslationService.translated_column(Product.name, Product.name_translations, lang)
+    category_name = TranslationService.translated_column(Category.name, Category.name_translations, lang)
     
-    top_selling_products = []
-    top_products_result = session.exec(top_products_query).all()
+    # Calculate all counters in a single round trip
+    with _timed(timings, "counts"):
+        counts = session.exec(
+            select(
+                select(func.count()).select_from(User).scalar_subquery().label("total_users"),
+                select(func.count()).select_from(Product).scalar_subquery().label("total_products"),
+                select(func.count()).select_from(Category).scalar_subquery().label("total_categories"),
+                # Order figures come from the daily rollups
+                select(func.coalesce(func.sum(DailyOrderSales.order_count), 0))
+                .scalar_subquery().label("total_orders"),
+                select(func.sum(DailyOrderSales.revenue)).where(
+                    DailyOrderSales.status != OrderStatus.CANCELLED
+                ).scalar_subquery().label("total_revenue"),
+                select(func.coalesce(func.sum(DailyOrderSales.order_count), 0)).where(
+                    DailyOrderSales.status == OrderStatus.PENDING
+                ).scalar_subquery().label("pending_orders"),
+                # Low stock products (less than 10 items)
+                select(func.count()).select_from(Product).where(
+                    Product.stock_quantity < 10,
+                    Product.is_active == True
+                ).scalar_subquery().label("low_stock_products"),
+            )
+        ).one()
     
-    for product_id, product_name, total_quantity, total_sales in top_products_result:
-        product = session.get(Product, product_id)
-        category_name = "Unknown"
+    # Get top selling products, then their names for just those five rows
+    with _timed(timings, "top_products"):
+        top_products = select(
+            DailyProductSales.product_id,
+            func.sum(DailyProductSales.quantity).label("total_quantity"),
+            func.sum(DailyProductSales.revenue).label("total_sales"),
+        ).group_by(
+            DailyProductSales.product_id
+        ).having(
+            func.sum(DailyProductSales.quantity) > 0
+        ).order_by(
+            func.sum(DailyProductSales.quantity).desc()
+        ).limit(5).subquery()
         
-        if product and product.category_id:
-            category = session.get(Category, product.category_id)
-            if category:
-                category_name = category.name
+        top_products_query = select(
+            top_products.c.product_id,
+            product_name,
+            top_products.c.total_quantity,
+            top_products.c.total_sales,
+            category_name,
+        ).outerjoin(
+            Product, top_products.c.product_id == Product.id
+        ).outerjoin(
+            Category, Product.category_id == Category.id
+        ).order_by(top_products.c.total_quantity.desc())
         
-        top_selling_products.append({
-            "product_id": product_id,
-            "name": product_name,
-            "total_quantity": total_quantity,
-            "total_sales": total_sales,
-            "category": category_name
-        })
-    
-    # Get recent orders
-    recent_orders_query = select(Order).order_by(Order.created_at.desc()).limit(5)
-    recent_orders = []
+        top_selling_products = [
+            {
+                "product_id": product_id,
+                "name": name,
+                "total_quantity": total_quantity,
+                "total_sales": total_sales,
+                "category": category or "Unknown"
+            }
+            for product_id, name, total_quantity, total_sales, category
+            in session.exec(top_products_query).all()
+        ]
     
-    for order in session.exec(recent_orders_query):
-        user = session.get(User, order.user_id)
-        username = user.full_name if user else "Unknown"
+    # Get recent orders with their customer names
+    with _timed(timings, "recent_orders"):
+        recent_orders_query = select(Order, User.full_name).outerjoin(
+            User, Order.user_id == User.id
+        ).order_by(Order.created_at.desc()).limit(5)
         
-        recent_orders.append({
-            "order_id": order.id,
-            "status": order.status,
-            "total_amount": order.total_amount,
-            "created_at": order.created_at.isoformat(),
-            "customer_name": username
-        })
+        recent_orders = [
+            {
+                "order_id": order.id,
+                "status": order.status,
+                "total_amount": order.total_amount,
+                "created_at": order.created_at.isoformat(),
+                "customer_name": customer_name or "Unknown"
+            }
+            for order, customer_name in session.exec(recent_orders_query).all()
+        ]
     
     # Get sales by category
-    sales_by_category_query = select(
-        Product.category_id,
-        func.sum(OrderItem.quantity * OrderItem.unit_price).label("total_sales")
-    ).join(OrderItem, Product.id == OrderItem.product_id).join(
-        Order, OrderItem.order_id == Order.id
-    ).where(
-        Order.status != OrderStatus.CANCELLED
-    ).group_by(
-        Product.category_id
-    )
-    
-    sales_by_category = []
-    sales_by_category_result = session.exec(sales_by_category_query).all()
-    
-    for category_id, total_sales in sales_by_category_result:
-        category = session.get(Category, category_id)
-        category_name = category.name if category else "Unknown"
+    with _timed(timings, "sales_by_category"):
+        category_sales = select(
+            DailyCategorySales.category_id,
+            func.sum(DailyCategorySales.revenue).label("total_sales")
+        ).group_by(
+            DailyCategorySales.category_id
+        ).having(
+            func.sum(DailyCategorySales.quantity) > 0
+        ).subquery()
+        
+        sales_by_category_query = select(
+            category_sales.c.category_id,
+            category_name,
+            category_sales.c.total_sales,
+        ).outerjoin(
+            Category, category_sales.c.category_id == Category.id
+        )
         
-        sales_by_category.append({
-            "category_id": category_id,
-            "name": category_name,
-            "total_sales": total_sales
-        })
+        sales_by_category = [
+            {
+                "category_id": category_id,
+                "name": name or "Unknown",
+                "total_sales": total_sales
+            }
+            for category_id, name, total_sales
+            in session.exec(sales_by_category_query).all()
+        ]
+    
+    response.headers["Server-Timing"] = _server_timing(timings)
     
     return DashboardStats(
-        total_users=total_users,
-        total_products=total_products,
-        total_categories=total_categories,
-        total_orders=total_orders,
-        total_revenue=total_revenue,
-        pending_orders=pending_orders,
-        low_stock_products=low_stock_products,
+        total_users=counts.total_users,
+        total_products=counts.total_products,
+        total_categories=counts.total_categories,
+        total_orders=counts.total_orders,
+        total_revenue=counts.total_revenue or 0.0,
+        pending_orders=counts.pending_orders,
+        low_stock_products=counts.low_stock_products,
         top_selling_products=top_selling_products,
         recent_orders=recent_orders,
         sales_by_category=sales_by_category
@@ -161,11 +196,15 @@ def get_sales_report(
     period: str = Query(..., enum=["daily", "weekly", "monthly", "yearly"]),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    breakdown: Optional[str] = Query(None, enum=["status", "category"]),
     current_user: User = Depends(get_current_staff_user),
     session: Session = Depends(get_session),
 ) -> Any:
     """
     Get sales report for a specific period (staff only).
+    
+    Served from the daily sales rollups. With `breakdown`, each bucket also carries its sales split by order
+    status or product category.
     """
     # Set default date range if not provided
     if not end_date:
@@ -185,84 +224,60 @@ def get_sales_report(
             # Last 5 years
             start_date = end_date - timedelta(days=365 * 5)
     
-    # Query orders within date range
-    orders_query = select(Order).where(
-        Order.created_at >= start_date,
-        Order.created_at <= end_date,
-        Order.status != OrderStatus.CANCELLED
-    )
+    # Read the daily rollups; only one row per bucket (and breakdown key)
+    # comes back. Rollups have day granularity, so the range covers whole days.
+    dialect = session.get_bind().dialect.name
     
-    orders = session.exec(orders_query).all()
+    if breakdown == "category":
+        day_column = DailyCategorySales.day
+        bucket = _period_bucket(period, day_column, dialect).label("bucket")
+        key = func.coalesce(Category.name, "Unknown").label("key")
+        sales_query = select(
+            bucket, key, func.sum(DailyCategorySales.revenue)
+        ).outerjoin(
+            Category, DailyCategorySales.category_id == Category.id
+        ).having(func.sum(DailyCategorySales.quantity) > 0)
+    else:
+        day_column = DailyOrderSales.day
+        bucket = _period_bucket(period, day_column, dialect).label("bucket")
+        if breakdown == "status":
+            key = DailyOrderSales.status.label("key")
+            sales_query = select(bucket, key, func.sum(DailyOrderSales.revenue))
+        else:
+            key = None
+            sales_query = select(bucket, func.sum(DailyOrderSales.revenue))
+        sales_query = sales_query.where(
+            DailyOrderSales.status != OrderStatus.CANCELLED
+        ).having(func.sum(DailyOrderSales.order_count) > 0)
+    
+    sales_query = sales_query.where(
+        day_column >= start_date.date(),
+        day_column <= end_date.date(),
+    )
+    group_by = [bucket] if key is None else [bucket, key]
+    sales_query = sales_query.group_by(*group_by).order_by(*group_by)
     
     # Organize data by period
     data = []
+    rows_by_bucket: Dict[str, Dict[str, Any]] = {}
     total_sales = 0
     
-    if period == "daily":
-        # Group by day
-        sales_by_day = {}
-        for order in orders:
-            day = order.created_at.date()
-            sales_by_day[day] = sales_by_day.get(day, 0) + order.total_amount
-            total_sales += order.total_amount
-        
-        # Format data
-        for day, amount in sorted(sales_by_day.items()):
-            data.append({
-                "date": day.isoformat(),
-                "sales": amount
-            })
-    
-    elif period == "weekly":
-        # Group by week
-        sales_by_week = {}
-        for order in orders:
-            # Calculate week number and year
-            year = order.created_at.year
-            week = order.created_at.isocalendar()[1]
-            week_key = f"{year}-W{week:02d}"
-            
-            sales_by_week[week_key] = sales_by_week.get(week_key, 0) + order.total_amount
-            total_sales += order.total_amount
+    for row in session.exec(sales_query).all():
+        period_key, amount = str(row[0]), row[-1] or 0
+        total_sales += amount
         
-        # Format data
-        for week_key, amount in sorted(sales_by_week.items()):
-            data.append({
-                "date": week_key,
-                "sales": amount
-            })
-    
-    elif period == "monthly":
-        # Group by month
-        sales_by_month = {}
-        for order in orders:
-            month_key = f"{order.created_at.year}-{order.created_at.month:02d}"
-            
-            sales_by_month[month_key] = sales_by_month.get(month_key, 0) + order.total_amount
-            total_sales += order.total_amount
+        entry = rows_by_bucket.get(period_key)
+        if entry is None:
+            entry = {"date": period_key, "sales": 0}
+            if key is not None:
+                entry["breakdown"] = {}
+            rows_by_bucket[period_key] = entry
+            data.append(entry)
         
-        # Format data
-        for month_key, amount in sorted(sales_by_month.items()):
-            data.append({
-                "date": month_key,
-                "sales": amount
-            })
-    
-    elif period == "yearly":
-        # Group by year
-        sales_by_year = {}
-        for order in orders:
-            year = order.created_at.year
-            
-            sales_by_year[year] = sales_by_year.get(year, 0) + order.total_amount
-            total_sales += order.total_amount
-        
-        # Format data
-        for year, amount in sorted(sales_by_year.items()):
-            data.append({
-                "date": str(year),
-                "sales": amount
-            })
+        entry["sales"] += amount
+        if key is not None:
+            breakdown_key = row[1].value if isinstance(row[1], OrderStatus) else row[1]
+            entry["breakdown"][breakdown_key] = amount
     
     return SalesReport(
         period=period,
@@ -270,36 +285,108 @@ def get_sales_report(
         total_sales=total_sales
     )
 
+def _period_bucket(period: str, column, dialect: str):
+    """
+    SQL expression formatting a timestamp as its report bucket
+    
+    Buckets look like 2024-03-15 (daily), 2024-W11 (ISO week), 2024-03
+    (monthly) and 2024 (yearly).
+    """
+    if dialect == "postgresql":
+        formats = {
+            "daily": "YYYY-MM-DD",
+            "weekly": 'IYYY-"W"IW',
+            "monthly": "YYYY-MM",
+            "yearly": "YYYY",
+        }
+        return func.to_char(column, formats[period])
+    
+    if period == "weekly":
+        # The Thursday of a date's ISO week decides the ISO year and week number
+        thursday = func.date(column, "-3 days", "weekday 4")
+        return func.printf(
+            "%s-W%02d",
+            func.strftime("%Y", thursday),
+            (func.strftime("%j", thursday) - 1) / 7 + 1,
+        )
+    
+    formats = {
+        "daily": "%Y-%m-%d",
+        "monthly": "%Y-%m",
+        "yearly": "%Y",
+    }
+    return func.strftime(formats[period], column)
+
 @router.get("/low-stock", response_model=List[Dict[str, Any]])
 def get_low_stock_products(
     threshold: int = Query(default=10, ge=1),
+    lang: str = Query("en", description="Language for product and category names (en, fr, ar)"),
     current_user: User = Depends(get_current_staff_user),
     session: Session = Depends(get_session),
 ) -> Any:
     """
     Get products with low stock (staff only).
     """
-    # Query low stock products
-    query = select(Product).where(
+    # Query low stock products with their names resolved in the database
+    query = select(
+        Product.id,
+        TranslationService.translated_column(Product.name, Product.name_translations, lang),
+        TranslationService.translated_column(Category.name, Category.name_translations, lang),
+        Product.stock_quantity,
+        Product.price,
+        Product.unit,
+    ).outerjoin(
+        Category, Product.category_id == Category.id
+    ).where(
         Product.stock_quantity <= threshold,
         Product.is_active == True
     ).order_by(Product.stock_quantity)
     
-    products = session.exec(query).all()
-    
     # Format response
-    result = []
-    for product in products:
-        category = session.get(Category, product.category_id)
-        category_name = category.name if category else "Unknown"
-        
-        result.append({
-            "id": product.id,
-            "name": product.name,
-            "category": category_name,
-            "stock_quantity": product.stock_quantity,
-            "price": product.price,
-            "unit": product.unit
-        })
-    
-    return result
\ No newline at end of file
+    return [
+        {
+            "id": product_id,
+            "name": name,
+            "category": category or "Unknown",
+            "stock_quantity": stock_quantity,
+            "price": price,
+            "unit": unit
+        }
+        for product_id, name, category, stock_quantity, price, unit in session.exec(query).all()
+    ]
+
+@router.get("/system", response_model=Dict[str, Any])
+def get_system_stats(
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Get runtime statistics of this worker process (admin only).
+    """
+    return {
+        "password_pool": password_pool.stats(),
+        "db_pool": get_pool_stats(),
+    }
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+def list_profiles(
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """
+    List stored request profiles, newest first (admin only).
+    """
+    return profile_store.list()
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Download a stored request profile (admin only).
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    meta, path = profile
+    media_type = "application/json" if meta["filename"].endswith(".json") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=meta["filename"])
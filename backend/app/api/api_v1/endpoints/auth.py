@@ -1,31 +1,52 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_session
 from app.core.security import (
     create_access_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_and_update_password_async,
 )
 from app.core.config import settings
+from app.core.profiling import ProfiledRoute
 from app.models.user import User, UserCreate, UserRead
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+def _get_user_by_email(session: Session, email: str) -> Optional[User]:
+    return session.exec(select(User).where(User.email == email)).first()
+
+def _save_user(session: Session, user: User) -> None:
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+# Both endpoints are async so that a request waiting for the password pool
+# doesn't hold a threadpool thread; their database work runs in the
+# threadpool like a sync endpoint's would.
 
 @router.post("/login", response_model=dict)
-def login_access_token(
+async def login_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = session.exec(select(User).where(User.email == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(_get_user_by_email, session, form_data.username)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -36,6 +57,11 @@ def login_access_token(
             detail="Inactive user"
         )
     
+    # Upgrade the stored hash if the hashing settings changed
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_in_threadpool(_save_user, session, user)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
@@ -45,14 +71,14 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=UserRead)
-def register_new_user(
+async def register_new_user(
     user_in: UserCreate,
     session: Session = Depends(get_session),
 ) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user = session.exec(select(User).where(User.email == user_in.email)).first()
+    user = await run_in_threadpool(_get_user_by_email, session, user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
@@ -61,14 +87,12 @@ def register_new_user(
     
     new_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         full_name=user_in.full_name,
         phone=user_in.phone,
         address=user_in.address,
         role=user_in.role,
         is_active=True,
     )
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await run_in_threadpool(_save_user, session, new_user)
     return new_user
\ No newline at end of file
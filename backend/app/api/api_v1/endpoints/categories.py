@@ -2,16 +2,20 @@
 from typing import Any, List
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select
 
 from app.database import get_session
 from app.models.category import Category, CategoryCreate, CategoryUpdate, CategoryRead
 from app.core.security import get_current_staff_user, get_current_active_user
-from app.core.translation import TranslationService
+from app.core.catalog_cache import catalog_cache
+from app.core.config import settings
+from app.core.profiling import ProfiledRoute
+from app.api.utils.http_cache import conditional_response, make_etag
+from app.api.utils.prerendered import json_list_response, json_response
 from app.models.user import User
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("", response_model=CategoryRead)
 def create_category(
@@ -36,53 +40,70 @@ def create_category(
     category = Category.model_validate(category_in)
     session.add(category)
     session.commit()
+    catalog_cache.invalidate()
     session.refresh(category)
     return category
 
 @router.get("", response_model=List[CategoryRead])
-def read_categories(
+async def read_categories(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     active_only: bool = Query(False),
     lang: str = Query("en", description="Language for translations (en, fr, ar)"),
-    session: Session = Depends(get_session),
 ) -> Any:
     """
     Retrieve categories with translation support.
+
+    Served pre-rendered from the in-process catalog cache.
     """
-    query = select(Category)
+    snapshot = await catalog_cache.get_snapshot_async()
     
-    if active_only:
-        query = query.where(Category.is_active == True)
+    not_modified = conditional_response(
+        request, response, make_etag("categories", snapshot.category_fingerprint),
+        max_age=settings.CATEGORIES_HTTP_MAX_AGE,
+    )
+    if not_modified:
+        return not_modified
     
-    categories = session.exec(query.offset(skip).limit(limit)).all()
+    categories = snapshot.categories
     
-    # Apply translations to each category
-    for category in categories:
-        TranslationService.apply_translations_to_model(category, lang)
+    if active_only:
+        categories = [category for category in categories if category.is_active]
     
-    return categories
+    rendered = await snapshot.category_json_async(lang)
+    return json_list_response(
+        (rendered[category.id] for category in categories[skip:skip + limit]), response
+    )
 
 @router.get("/{category_id}", response_model=CategoryRead)
-def read_category(
+async def read_category(
+    request: Request,
+    response: Response,
     category_id: int,
     lang: str = Query("en", description="Language for translations (en, fr, ar)"),
-    session: Session = Depends(get_session),
 ) -> Any:
     """
     Get category by ID with translation support.
     """
-    category = session.get(Category, category_id)
+    snapshot = await catalog_cache.get_snapshot_async()
+    category = snapshot.categories_by_id.get(category_id)
     if not category:
         raise HTTPException(
             status_code=404,
             detail="Category not found",
         )
     
-    # Apply translations
-    TranslationService.apply_translations_to_model(category, lang)
+    not_modified = conditional_response(
+        request, response, make_etag("category", snapshot.category_digests[category_id]),
+        max_age=settings.CATEGORIES_HTTP_MAX_AGE,
+        last_modified=category.updated_at or category.created_at,
+    )
+    if not_modified:
+        return not_modified
     
-    return category
+    return json_response((await snapshot.category_json_async(lang))[category_id], response)
 
 @router.patch("/{category_id}", response_model=CategoryRead)
 def update_category(
@@ -122,6 +143,7 @@ def update_category(
     
     session.add(category)
     session.commit()
+    catalog_cache.invalidate()
     session.refresh(category)
     return category
 
@@ -153,4 +175,5 @@ def delete_category(
         session.delete(category)
         session.commit()
     
+    catalog_cache.invalidate()
     return None
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
+from sqlalchemy import bindparam, insert, update
 from sqlalchemy.orm import joinedload
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session, select, or_, and_
 
 from app.database import get_session
 from app.models.order import (
@@ -11,10 +12,17 @@ from app.models.order import (
 )
 from app.models.product import Product
 from app.core.security import get_current_active_user, get_current_staff_user
+from app.core.catalog_cache import catalog_cache
+from app.core.rollups import sales_rollups
+from app.core.profiling import ProfiledRoute
 from app.models.user import User, UserRole
 from app.api.utils.common import format_price
+from app.api.utils.pagination import decode_cursor, set_next_cursor
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# Order listings are always newest first
+ORDERS_ORDERING = "created_at:desc"
 
 @router.post("", response_model=OrderRead)
 def create_order(
@@ -32,13 +40,28 @@ def create_order(
             detail="Not authorized to create order for another user",
         )
     
+    # Load every product in the basket with one query. On backends with
+    # row locks the rows stay locked until commit, so concurrent checkouts
+    # see each other's stock updates. Locking in ID order keeps two
+    # checkouts with overlapping baskets from deadlocking.
+    product_ids = {item.product_id for item in order_in.items}
+    products_query = select(Product).where(Product.id.in_(product_ids)).order_by(Product.id)
+    if session.get_bind().dialect.name != "sqlite":
+        products_query = products_query.with_for_update()
+    products = {product.id: product for product in session.exec(products_query).all()}
+    
+    # Total quantity per product, in case a product is listed more than once
+    requested: Dict[int, float] = {}
+    for item in order_in.items:
+        requested[item.product_id] = requested.get(item.product_id, 0) + item.quantity
+    
     # Process order items
     order_items = []
     total_amount = 0
     
     for item in order_in.items:
         # Check if product exists and is active
-        product = session.get(Product, item.product_id)
+        product = products.get(item.product_id)
         if not product:
             raise HTTPException(
                 status_code=404,
@@ -52,7 +75,7 @@ def create_order(
             )
         
         # Check stock
-        if product.stock_quantity < item.quantity:
+        if product.stock_quantity < requested[item.product_id]:
             raise HTTPException(
                 status_code=400,
                 detail=f"Not enough stock for {product.name}. Available: {product.stock_quantity}",
@@ -62,21 +85,52 @@ def create_order(
         item_total = product.price * item.quantity
         total_amount += item_total
         
-        # Create order item
-        order_item = OrderItem(
-            product_id=item.product_id,
-            quantity=item.quantity,
-            unit_price=product.price,
-            product_name=product.name,
-            product_unit=product.unit,
-            order_id=0  # Will be updated after order creation
+        # Order item row, inserted in bulk once the order has an ID
+        order_items.append({
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_price": product.price,
+            "product_name": product.name,
+            "product_unit": product.unit,
+        })
+    
+    # Update product stock with one executemany. The stock check is repeated
+    # inside the UPDATE so that it is atomic even where rows could not be
+    # locked (SQLite); rows failing it are skipped and show in the rowcount.
+    # Drivers that can't report it (psycopg2) run on locked rows, where the
+    # check above is already exact.
+    stock_updated_at = datetime.now(timezone.utc)
+    products_table = Product.__table__
+    result = session.exec(
+        update(products_table)
+        .where(
+            products_table.c.id == bindparam("product_id"),
+            products_table.c.stock_quantity >= bindparam("quantity"),
         )
-        
-        order_items.append(order_item)
-        
-        # Update product stock
-        product.stock_quantity -= item.quantity
-        session.add(product)
+        .values(
+            stock_quantity=products_table.c.stock_quantity - bindparam("quantity"),
+            updated_at=stock_updated_at,
+        ),
+        params=[
+            {"product_id": product_id, "quantity": quantity}
+            for product_id, quantity in sorted(requested.items())
+        ],
+    )
+    if session.get_bind().dialect.supports_sane_multi_rowcount and result.rowcount != len(requested):
+        session.rollback()
+        short = session.exec(
+            select(Product.id, Product.name, Product.stock_quantity).where(Product.id.in_(product_ids))
+        ).all()
+        names = [name for product_id, name, stock in short if stock < requested[product_id]]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Not enough stock for {', '.join(names) or 'the requested products'}",
+        )
+    
+    # New stock levels, read back inside the transaction for the catalog cache
+    stock_levels = session.exec(
+        select(Product.id, Product.stock_quantity, Product.updated_at).where(Product.id.in_(product_ids))
+    ).all()
     
     # Format total amount
     total_amount = format_price(total_amount)
@@ -91,47 +145,72 @@ def create_order(
     )
     
     session.add(order)
-    session.commit()
-    session.refresh(order)
+    session.flush()
     
-    # Update order items with order ID and add to database
+    # Add order items in the same transaction
     for item in order_items:
-        item.order_id = order.id
-        session.add(item)
+        item["order_id"] = order.id
+    session.exec(insert(OrderItem), params=order_items)
+    
+    # Update the daily sales aggregates in the same transaction
+    sales_rollups.record_order(session, order, [
+        (
+            item["product_id"],
+            products[item["product_id"]].category_id,
+            item["quantity"],
+            item["quantity"] * item["unit_price"],
+        )
+        for item in order_items
+    ])
     
     session.commit()
+    # Only stock levels changed, so patch them into the cached catalog
+    # instead of rebuilding it
+    catalog_cache.update_products({
+        product_id: {"stock_quantity": stock_quantity, "updated_at": updated_at}
+        for product_id, stock_quantity, updated_at in stock_levels
+    })
     session.refresh(order)
     
     return order
 
-# The rest of the file remains unchanged
 @router.get("", response_model=List[OrderRead])
 def read_user_orders(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_session),
 ) -> Any:
     """
-    Get current user's orders.
+    Get current user's orders, newest first.
+    
+    Full pages carry an X-Next-Cursor header; passing it back as `cursor`
+    continues after the last row (and ignores `skip`).
     """
+    query = select(Order).order_by(Order.created_at.desc(), Order.id.desc())
+    
     # Regular users can only see their own orders
     if current_user.role == UserRole.CUSTOMER:
-        orders = session.exec(
-            select(Order)
-            .where(Order.user_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(Order.created_at.desc())
-        ).all()
+        query = query.where(Order.user_id == current_user.id)
     # Staff and admins can see all orders
+    
+    if cursor:
+        # Seek past the last row of the previous page instead of offsetting
+        created_at, last_id = decode_cursor(cursor, ORDERS_ORDERING, datetime_key=True)
+        query = query.where(
+            or_(
+                Order.created_at < created_at,
+                and_(Order.created_at == created_at, Order.id < last_id),
+            )
+        )
     else:
-        orders = session.exec(
-            select(Order)
-            .offset(skip)
-            .limit(limit)
-            .order_by(Order.created_at.desc())
-        ).all()
+        query = query.offset(skip)
+    
+    orders = session.exec(query.limit(limit)).all()
+    
+    set_next_cursor(response, orders, limit, ORDERS_ORDERING, "created_at")
     
     return orders
 
@@ -212,11 +291,15 @@ def update_order(
         update_data = order_in.model_dump(exclude_unset=True)
     
     # Apply updates
+    previous_status = order.status
     for field, value in update_data.items():
         setattr(order, field, value)
     
     order.updated_at = datetime.now(timezone.utc)
     
+    # Move the order between daily sales aggregates on status transitions
+    sales_rollups.record_status_change(session, order, previous_status)
+    
     session.add(order)
     session.commit()
     session.refresh(order)
@@ -1,19 +1,28 @@
 # backend/app/api/api_v1/endpoints/products.py
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Literal, Optional
 from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right
+from itertools import islice
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, or_, func
-from sqlalchemy import Text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.database import get_session
+from app.database import get_async_session, get_session
 from app.models.product import Product, ProductCreate, ProductUpdate, ProductRead
 from app.models.category import Category
 from app.core.security import get_current_staff_user, get_current_active_user
 from app.core.translation import TranslationService
+from app.core.catalog_cache import catalog_cache
+from app.core.config import settings
+from app.core.search import product_search
+from app.core.profiling import ProfiledRoute
 from app.models.user import User
+from app.api.utils.pagination import decode_cursor, set_next_cursor
+from app.api.utils.http_cache import conditional_response, make_etag
+from app.api.utils.prerendered import json_list_response, json_response
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("", response_model=ProductRead)
 def create_product(
@@ -34,12 +43,17 @@ def create_product(
     
     product = Product.model_validate(product_in)
     session.add(product)
+    session.flush()
+    product_search.index_product(session, product)
     session.commit()
+    catalog_cache.invalidate()
     session.refresh(product)
     return product
 
 @router.get("", response_model=List[ProductRead])
-def read_products(
+async def read_products(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category_id: Optional[int] = None,
@@ -48,98 +62,178 @@ def read_products(
     search: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    sort_by: str = Query("name", enum=["name", "price", "created_at"]),
-    sort_order: str = Query("asc", enum=["asc", "desc"]),
+    sort_by: Literal["name", "price", "created_at", "relevance"] = Query("name"),
+    sort_order: Literal["asc", "desc"] = Query("asc"),
     lang: str = Query("en", description="Language for translations (en, fr, ar)"),
-    session: Session = Depends(get_session),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Any:
     """
     Retrieve products with various filters and translation support.
+
+    Served from the in-process catalog cache; the database is only queried
+    when the cache needs to be rebuilt and for full-text search lookups.
+    
+    `search` matches any part of the name or description, in any language.
+    With sort_by=relevance, products matching whole words or word prefixes
+    come first, ranked by the full-text index, followed by the other
+    matches by name.
+    
+    Full pages carry an X-Next-Cursor header; passing it back as `cursor`
+    continues after the last row (and ignores `skip`).
+    
+    Responses carry an ETag of the catalog contents; a matching
+    If-None-Match gets an empty 304.
     """
-    query = select(Product)
+    snapshot = await catalog_cache.get_snapshot_async()
+    
+    not_modified = conditional_response(
+        request, response, make_etag("products", snapshot.fingerprint),
+        max_age=settings.PRODUCTS_HTTP_MAX_AGE,
+    )
+    if not_modified:
+        return not_modified
+    
+    # Look up search matches in the full-text index (ranked by relevance)
+    ranked_ids = await session.run_sync(product_search.search, search) if search else None
+    
+    # Apply sorting (the snapshot keeps each ordering precomputed)
+    ordering = f"{sort_by}:{sort_order}"
+    if sort_by == "relevance" and ranked_ids is not None:
+        if cursor:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination is not available when sorting by relevance",
+            )
+        key_field = None
+        products = [snapshot.by_id[pid] for pid in ranked_ids if pid in snapshot.by_id]
+        ranked = set(ranked_ids)
+        term, search_text = search.lower(), snapshot.search_text
+        products += [
+            p for p in snapshot.sorted_by("name")
+            if p.id not in ranked and term in search_text[p.id]
+        ]
+        if sort_order == "desc":
+            products = reversed(products)
+    else:
+        key_field = "name" if sort_by == "relevance" else sort_by
+        products = _keyset_page_source(
+            snapshot.sorted_by(key_field), key_field, sort_order, cursor, ordering
+        )
     
     # Apply filters
     if category_id:
-        query = query.where(Product.category_id == category_id)
+        products = (p for p in products if p.category_id == category_id)
     
     if is_organic is not None:
-        query = query.where(Product.is_organic == is_organic)
+        products = (p for p in products if p.is_organic == is_organic)
     
     if active_only:
-        query = query.where(Product.is_active == True)
+        products = (p for p in products if p.is_active)
     
     if min_price is not None:
-        query = query.where(Product.price >= min_price)
+        products = (p for p in products if p.price >= min_price)
     
     if max_price is not None:
-        query = query.where(Product.price <= max_price)
+        products = (p for p in products if p.price <= max_price)
     
-    if search:
-        # Search in basic text fields (default language)
-        search_conditions = [
-            Product.name.ilike(f"%{search}%"),
-            Product.description.ilike(f"%{search}%")
-        ]
-        
-        # Search in translations for the current language
-        if lang and lang in ['en', 'fr', 'ar']:
-            # PostgreSQL JSON extraction: Search in specific language translations
-            search_conditions.extend([
-                func.coalesce(
-                    func.json_extract_path_text(Product.name_translations, lang),
-                    Product.name
-                ).ilike(f"%{search}%"),
-                func.coalesce(
-                    func.json_extract_path_text(Product.description_translations, lang),
-                    Product.description
-                ).ilike(f"%{search}%")
-            ])
-        else:
-            # Fallback: Search in all translations (convert entire JSON to text)
-            search_conditions.extend([
-                func.cast(Product.name_translations, Text).ilike(f"%{search}%"),
-                func.cast(Product.description_translations, Text).ilike(f"%{search}%")
-            ])
-        
-        query = query.where(or_(*search_conditions))
-    
-    # Apply sorting
-    if sort_by == "name":
-        query = query.order_by(Product.name.desc() if sort_order == "desc" else Product.name)
-    elif sort_by == "price":
-        query = query.order_by(Product.price.desc() if sort_order == "desc" else Product.price)
-    elif sort_by == "created_at":
-        query = query.order_by(Product.created_at.desc() if sort_order == "desc" else Product.created_at)
+    if ranked_ids is not None:
+        # The index only matches words and word prefixes; other substrings
+        # (e.g. "pple" in "Apples") are found in the snapshot
+        matches = set(ranked_ids)
+        term = search.lower()
+        search_text = snapshot.search_text
+        products = (p for p in products if p.id in matches or term in search_text[p.id])
+    elif search:
+        # No full-text index on this backend, fall back to scanning
+        products = (p for p in products if _matches_search(p, search, lang))
     
     # Apply pagination
-    products = session.exec(query.offset(skip).limit(limit)).all()
+    if cursor:
+        page = list(islice(products, limit))
+    else:
+        page = list(islice(products, skip, skip + limit))
+    
+    if key_field:
+        set_next_cursor(response, page, limit, ordering, key_field)
+    
+    # Join the rows already rendered for the requested language
+    rendered = await snapshot.product_json_async(lang)
+    return json_list_response((rendered[product.id] for product in page), response)
+
+def _keyset_page_source(
+    rows: List[ProductRead],
+    key_field: str,
+    sort_order: str,
+    cursor: Optional[str],
+    ordering: str,
+) -> Iterator[ProductRead]:
+    """
+    Iterate a sorted snapshot list starting right after the cursor position
+
+    The list is ordered by (key, id), so the cursor position is found with a
+    binary search rather than by walking the earlier pages.
+    """
+    start, end = 0, len(rows)
     
-    # Apply translations to each product
-    for product in products:
-        TranslationService.apply_translations_to_model(product, lang)
+    if cursor:
+        last = decode_cursor(cursor, ordering, datetime_key=key_field == "created_at")
+        sort_key = lambda product: (getattr(product, key_field), product.id)
+        try:
+            if sort_order == "desc":
+                end = bisect_left(rows, last, key=sort_key)
+            else:
+                start = bisect_right(rows, last, key=sort_key)
+        except TypeError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     
-    return products
+    if sort_order == "desc":
+        return (rows[i] for i in range(end - 1, start - 1, -1))
+    return (rows[i] for i in range(start, end))
+
+def _matches_search(product: ProductRead, search: str, lang: str) -> bool:
+    """Case-insensitive substring match over names, descriptions and translations"""
+    term = search.lower()
+    fields = [product.name, product.description]
+    
+    if lang and lang in TranslationService.SUPPORTED_LANGUAGES:
+        # Search in specific language translations
+        fields.append((product.name_translations or {}).get(lang) or product.name)
+        fields.append((product.description_translations or {}).get(lang) or product.description)
+    else:
+        # Fallback: Search in all translations
+        fields.extend((product.name_translations or {}).values())
+        fields.extend((product.description_translations or {}).values())
+    
+    return any(field and term in field.lower() for field in fields)
 
 @router.get("/{product_id}", response_model=ProductRead)
-def read_product(
+async def read_product(
+    request: Request,
+    response: Response,
     product_id: int,
     lang: str = Query("en", description="Language for translations (en, fr, ar)"),
-    session: Session = Depends(get_session),
 ) -> Any:
     """
     Get product by ID with translation support.
     """
-    product = session.get(Product, product_id)
+    snapshot = await catalog_cache.get_snapshot_async()
+    product = snapshot.by_id.get(product_id)
     if not product:
         raise HTTPException(
             status_code=404,
             detail="Product not found",
         )
     
-    # Apply translations
-    TranslationService.apply_translations_to_model(product, lang)
+    not_modified = conditional_response(
+        request, response, make_etag("product", snapshot.digests[product_id]),
+        max_age=settings.PRODUCTS_HTTP_MAX_AGE,
+        last_modified=product.updated_at or product.created_at,
+    )
+    if not_modified:
+        return not_modified
     
-    return product
+    return json_response((await snapshot.product_json_async(lang))[product_id], response)
 
 @router.patch("/{product_id}", response_model=ProductRead)
 def update_product(
@@ -175,7 +269,9 @@ def update_product(
     product.updated_at = datetime.now(timezone.utc)
     
     session.add(product)
+    product_search.index_product(session, product)
     session.commit()
+    catalog_cache.invalidate()
     session.refresh(product)
     return product
 
@@ -204,39 +300,44 @@ def delete_product(
         session.commit()
     else:
         # Delete product if no related records
+        product_search.remove_product(session, product.id)
         session.delete(product)
         session.commit()
     
+    catalog_cache.invalidate()
     return None
 
 @router.get("/category/{category_id}", response_model=List[ProductRead])
-def read_products_by_category(
+async def read_products_by_category(
+    request: Request,
+    response: Response,
     category_id: int,
     active_only: bool = Query(True),
     lang: str = Query("en", description="Language for translations (en, fr, ar)"),
-    session: Session = Depends(get_session),
 ) -> Any:
     """
     Get all products in a specific category with translation support.
     """
+    snapshot = await catalog_cache.get_snapshot_async()
+    
     # Check if category exists
-    category = session.get(Category, category_id)
-    if not category:
+    if category_id not in snapshot.categories_by_id:
         raise HTTPException(
             status_code=404,
             detail="Category not found",
         )
     
-    # Build query
-    query = select(Product).where(Product.category_id == category_id)
-    
-    if active_only:
-        query = query.where(Product.is_active == True)
-    
-    products = session.exec(query).all()
+    not_modified = conditional_response(
+        request, response, make_etag("products", snapshot.fingerprint),
+        max_age=settings.PRODUCTS_HTTP_MAX_AGE,
+    )
+    if not_modified:
+        return not_modified
     
-    # Apply translations to each product
-    for product in products:
-        TranslationService.apply_translations_to_model(product, lang)
+    rendered = await snapshot.product_json_async(lang)
     
-    return products
\ No newline at end of file
+    return json_list_response((
+        rendered[product.id]
+        for product in snapshot.products
+        if product.category_id == category_id and (product.is_active or not active_only)
+    ), response)
\ No newline at end of file
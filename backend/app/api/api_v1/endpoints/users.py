@@ -1,25 +1,43 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import Session, select, func
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_session
 from app.models.user import User, UserUpdate, UserRead, UserRole
 from app.core.security import (
     get_current_active_user,
     get_current_admin_user,
-    get_password_hash,
+    get_password_hash_async,
+    user_cache,
 )
+from app.core.profiling import ProfiledRoute
+from app.api.utils.pagination import decode_cursor, set_next_cursor
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Add response model for paginated users
 class UsersResponse(BaseModel):
     users: List[UserRead]
     total: int
 
+# User listings are ordered by ID
+USERS_ORDERING = "id:asc"
+
+def _save_user(session: Session, user: User) -> None:
+    session.add(user)
+    session.commit()
+    # Role or active status may have changed
+    user_cache.invalidate(user.email)
+    session.refresh(user)
+
+# Endpoints that hash passwords are async so that a request waiting for the
+# password pool doesn't hold a threadpool thread; their database work runs
+# in the threadpool like a sync endpoint's would.
+
 @router.get("/me", response_model=UserRead)
 def read_user_me(
     current_user: User = Depends(get_current_active_user),
@@ -30,7 +48,7 @@ def read_user_me(
     return current_user
 
 @router.patch("/me", response_model=UserRead)
-def update_user_me(
+async def update_user_me(
     user_in: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_session),
@@ -50,7 +68,7 @@ def update_user_me(
     
     # Handle password update
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
     
     # Apply updates
     for field, value in update_data.items():
@@ -58,26 +76,37 @@ def update_user_me(
     
     current_user.updated_at = datetime.now(timezone.utc)
     
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await run_in_threadpool(_save_user, session, current_user)
     return current_user
 
 @router.get("", response_model=UsersResponse)
 def read_users(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     current_user: User = Depends(get_current_admin_user),
     session: Session = Depends(get_session),
 ) -> Any:
     """
     Retrieve users (admin only).
+    
+    Full pages carry an X-Next-Cursor header; passing it back as `cursor`
+    continues after the last row (and ignores `skip`).
     """
     # Get total count
     total = session.exec(select(func.count()).select_from(User)).first()
     
     # Get users with pagination
-    users = session.exec(select(User).offset(skip).limit(limit)).all()
+    query = select(User).order_by(User.id)
+    if cursor:
+        _, last_id = decode_cursor(cursor, USERS_ORDERING)
+        query = query.where(User.id > last_id)
+    else:
+        query = query.offset(skip)
+    users = session.exec(query.limit(limit)).all()
+    
+    set_next_cursor(response, users, limit, USERS_ORDERING, "id")
     
     # Return structured response
     return UsersResponse(users=users, total=total)
@@ -108,7 +137,7 @@ def read_user_by_id(
     return user
 
 @router.patch("/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: int,
     user_in: UserUpdate,
     current_user: User = Depends(get_current_admin_user),
@@ -117,7 +146,7 @@ def update_user(
     """
     Update a user (admin only).
     """
-    user = session.get(User, user_id)
+    user = await run_in_threadpool(session.get, User, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -129,7 +158,7 @@ def update_user(
     
     # Handle password update
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
     
     # Apply updates
     for field, value in update_data.items():
@@ -137,9 +166,7 @@ def update_user(
     
     user.updated_at = datetime.now(timezone.utc)
     
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    await run_in_threadpool(_save_user, session, user)
     return user
 
 @router.delete("/{user_id}")
@@ -167,4 +194,5 @@ def delete_user(
     
     session.delete(user)
     session.commit()
+    user_cache.invalidate(user.email)
     return None
\ No newline at end of file
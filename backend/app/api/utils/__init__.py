@@ -1,2 +1,5 @@
 # Import utility functions to make them available
-from app.api.utils.common import format_price, calculate_order_total, format_date
\ No newline at end of file
+from app.api.utils.common import format_price, calculate_order_total, format_date
+from app.api.utils.pagination import encode_cursor, decode_cursor, next_cursor
+from app.api.utils.http_cache import make_etag, conditional_response
+from app.api.utils.prerendered import json_response, json_list_response
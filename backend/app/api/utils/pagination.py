@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+# Response header carrying the cursor of the next page (every cursor
+# paginated listing returns it there, never in the body)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(ordering: str, key: Any, id: int) -> str:
+    """
+    Encode the last row of a page into an opaque cursor
+
+    Args:
+        ordering: Sort the cursor belongs to (e.g. "price:asc")
+        key: Sort key value of the last row
+        id: ID of the last row (tie-breaker)
+    """
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = json.dumps({"o": ordering, "k": key, "id": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, ordering: str, datetime_key: bool = False) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Returns:
+        (key, id) of the last row of the previous page
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, id = payload["k"], int(payload["id"])
+        if datetime_key:
+            key = datetime.fromisoformat(key)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("o") != ordering:
+        raise HTTPException(
+            status_code=400,
+            detail="Cursor does not match the requested sort order",
+        )
+    return key, id
+
+def next_cursor(rows: list, limit: int, ordering: str, key_field: str) -> Optional[str]:
+    """Build the cursor for the page after `rows`, or None if this was the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(ordering, getattr(last, key_field), last.id)
+
+def set_next_cursor(response: Response, rows: list, limit: int, ordering: str, key_field: str) -> None:
+    """Send the cursor for the page after `rows` in the X-Next-Cursor header, unless this was the last page"""
+    cursor = next_cursor(rows, limit, ordering, key_field)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
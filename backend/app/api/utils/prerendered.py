@@ -0,0 +1,16 @@
+from typing import Iterable
+
+from fastapi import Response
+
+def json_response(body: bytes, response: Response) -> Response:
+    """
+    Return an already rendered JSON body as-is
+
+    Skips FastAPI's response model validation and encoding; headers set on
+    the endpoint's injected `response` are carried over.
+    """
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+def json_list_response(items: Iterable[bytes], response: Response) -> Response:
+    """Return a JSON array built from already rendered items"""
+    return json_response(b"[" + b",".join(items) + b"]", response)
@@ -0,0 +1,312 @@
+# backend/app/catalog_import.py
+"""
+Bulk import of categories and products from CSV or JSON Lines
+
+Rows are streamed in chunks: each chunk is validated, matched against the
+existing catalog by name (categories and products are looked up once per
+run, not once per row), written with one bulk INSERT and one bulk UPDATE,
+added to the search index and committed. Usage:
+
+    python -m app.catalog_import --categories categories.csv --products products.jsonl
+
+Products name their category with `category_name` (or give `category_id`).
+In CSV files the translation and quantity_config columns hold JSON, e.g.
+`{"fr": "Pommes", "ar": "تفاح"}`; empty cells are treated as missing.
+"""
+import argparse
+import csv
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlmodel import Session, SQLModel, select
+
+from app.core.search import product_search
+from app.models.category import Category, CategoryCreate, CategoryUpdate
+from app.models.product import Product, ProductCreate, ProductUpdate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Columns stored as JSON, given as JSON text in CSV files
+JSON_COLUMNS = ("name_translations", "description_translations", "quantity_config")
+
+
+class UnreadableRow:
+    """A line of an import file that could not be decoded into a row"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+
+# (line number, raw row) as read from an import file
+SourceRow = Tuple[int, Union[Dict[str, Any], UnreadableRow]]
+
+
+class ImportStats:
+    """Row counters and throughput of one import"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = time.perf_counter()
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+
+    @property
+    def rows(self) -> int:
+        return self.added + self.updated + self.unchanged + self.skipped
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.label}: {self.rows} rows ({self.added} added, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.skipped} skipped), {self.rows_per_second:,.0f} rows/s"
+        )
+
+
+def read_rows(path: Path) -> Iterator[SourceRow]:
+    """
+    Stream the rows of a .csv or .jsonl/.ndjson file
+
+    Lines holding invalid JSON come out as an UnreadableRow, so the importer
+    skips them with their line number instead of aborting the whole file.
+    """
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                row = {key: value for key, value in row.items() if key and value not in (None, "")}
+                try:
+                    for column in JSON_COLUMNS:
+                        if column in row:
+                            row[column] = json.loads(row[column])
+                except json.JSONDecodeError as error:
+                    row = UnreadableRow(f"{column}: invalid JSON ({error.msg})")
+                yield reader.line_num, row
+    elif path.suffix.lower() in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    row = UnreadableRow(f"invalid JSON ({error.msg})")
+                if not isinstance(row, (dict, UnreadableRow)):
+                    row = UnreadableRow("expected a JSON object")
+                yield line_number, row
+    else:
+        raise ValueError(f"Unsupported file type '{path.suffix}', expected .csv, .jsonl or .ndjson")
+
+
+def numbered(rows: Iterable[Dict[str, Any]]) -> Iterator[SourceRow]:
+    """Number in-memory rows (e.g. the sample data) like the rows of a file"""
+    return enumerate(rows, start=1)
+
+
+def _chunks(rows: Iterable[SourceRow], size: int) -> Iterator[List[SourceRow]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _skip(stats: ImportStats, line: int, reason: str) -> None:
+    logger.warning(f"{stats.label} line {line} skipped: {reason}")
+    stats.skipped += 1
+
+
+def _validate(
+    create_model: Type[SQLModel],
+    update_model: Type[SQLModel],
+    existing: Dict[str, int],
+    line: int,
+    row: Dict[str, Any],
+    stats: ImportStats,
+) -> Optional[SQLModel]:
+    """
+    Validate a row as a new record, or as a partial update if its name exists
+
+    Updates only need the name and the columns being changed.
+    """
+    model = update_model if row.get("name") in existing else create_model
+    try:
+        return model.model_validate(row)
+    except ValidationError as error:
+        _skip(stats, line, "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+        ))
+        return None
+
+
+def _write_chunk(
+    session: Session,
+    model: Type[SQLModel],
+    rows: Dict[str, SQLModel],
+    existing: Dict[str, int],
+    stats: ImportStats,
+) -> List[int]:
+    """
+    Insert the new rows and update the existing ones of a validated chunk
+
+    `rows` maps each name to its validated create or update model;
+    `existing` maps names to IDs and is extended with the inserted rows.
+    Returns the IDs of every written row.
+    """
+    now = datetime.now(timezone.utc)
+    new_names = [name for name in rows if name not in existing]
+
+    inserts = [{**rows[name].model_dump(), "created_at": now} for name in new_names]
+    if inserts:
+        ids = session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True), inserts
+        ).all()
+        existing.update(zip(new_names, ids))
+        stats.added += len(inserts)
+
+    # Only the columns present in the input are overwritten
+    updates = [
+        {**values.model_dump(exclude_unset=True), "id": existing[name], "updated_at": now}
+        for name, values in rows.items() if name not in new_names
+    ]
+    if updates:
+        session.execute(update(model), updates)
+        stats.updated += len(updates)
+
+    return [existing[name] for name in new_names] + [values["id"] for values in updates]
+
+
+def _deduplicate(validated: Dict[str, SQLModel], name: str, stats: ImportStats) -> None:
+    # A name repeated within a chunk: the last row wins
+    if name in validated:
+        stats.skipped += 1
+
+
+def import_categories(
+    session: Session,
+    rows: Iterable[SourceRow],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    update_existing: bool = True,
+) -> ImportStats:
+    """Add or update categories, matched by name"""
+    stats = ImportStats("categories")
+    existing = dict(session.exec(select(Category.name, Category.id)).all())
+
+    for chunk in _chunks(rows, chunk_size):
+        validated: Dict[str, SQLModel] = {}
+        for line, row in chunk:
+            if isinstance(row, UnreadableRow):
+                _skip(stats, line, row.reason)
+                continue
+            if not update_existing and row.get("name") in existing:
+                stats.unchanged += 1
+                continue
+
+            category = _validate(CategoryCreate, CategoryUpdate, existing, line, row, stats)
+            if category is None:
+                continue
+            _deduplicate(validated, row["name"], stats)
+            validated[row["name"]] = category
+
+        _write_chunk(session, Category, validated, existing, stats)
+        session.commit()
+        session.expunge_all()
+        logger.info(str(stats))
+
+    return stats
+
+
+def import_products(
+    session: Session,
+    rows: Iterable[SourceRow],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    update_existing: bool = True,
+) -> ImportStats:
+    """
+    Add or update products, matched by name
+
+    Each chunk is added to the search index in the same transaction. Running
+    API workers pick the changes up when their catalog cache expires
+    (CATALOG_CACHE_TTL_SECONDS).
+    """
+    stats = ImportStats("products")
+    categories = dict(session.exec(select(Category.name, Category.id)).all())
+    category_ids = set(categories.values())
+    existing = dict(session.exec(select(Product.name, Product.id)).all())
+
+    for chunk in _chunks(rows, chunk_size):
+        validated: Dict[str, SQLModel] = {}
+        for line, row in chunk:
+            if isinstance(row, UnreadableRow):
+                _skip(stats, line, row.reason)
+                continue
+            if not update_existing and row.get("name") in existing:
+                stats.unchanged += 1
+                continue
+
+            row = dict(row)
+            category_name = row.pop("category_name", None)
+            if category_name is not None:
+                if category_name not in categories:
+                    _skip(stats, line, f"unknown category '{category_name}'")
+                    continue
+                row["category_id"] = categories[category_name]
+
+            product = _validate(ProductCreate, ProductUpdate, existing, line, row, stats)
+            if product is None:
+                continue
+            if product.category_id is not None and product.category_id not in category_ids:
+                _skip(stats, line, f"unknown category ID {product.category_id}")
+                continue
+            _deduplicate(validated, row["name"], stats)
+            validated[row["name"]] = product
+
+        written = _write_chunk(session, Product, validated, existing, stats)
+        if written:
+            # Only the indexed columns are needed, not full ORM objects
+            indexed = select(
+                Product.id, Product.name, Product.description,
+                Product.name_translations, Product.description_translations,
+            ).where(Product.id.in_(written))
+            product_search.index_products(session, session.exec(indexed).all())
+        session.commit()
+        session.expunge_all()
+        logger.info(str(stats))
+
+    return stats
+
+
+if __name__ == "__main__":
+    from app.database import engine
+    # Register the remaining models so every relationship can be resolved
+    from app.models import order, user  # noqa: F401
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Bulk import categories and products from CSV or JSON Lines")
+    parser.add_argument("--categories", type=Path, help="categories file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("--products", type=Path, help="products file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per transaction")
+    parser.add_argument("--no-update", action="store_true", help="only add new rows, leave existing ones as they are")
+    args = parser.parse_args()
+    if not args.categories and not args.products:
+        parser.error("nothing to import, pass --categories and/or --products")
+
+    with Session(engine) as session:
+        # Categories first, so products can refer to the new ones
+        if args.categories:
+            import_categories(session, read_rows(args.categories), args.chunk_size, not args.no_update)
+        if args.products:
+            import_products(session, read_rows(args.products), args.chunk_size, not args.no_update)
@@ -1,17 +1,10 @@
 from sqlmodel import Session, select
 from datetime import datetime, timezone
-from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    """Get password hash"""
-    return pwd_context.hash(password)
-
 def create_admin_user(session: Session) -> None:
     """Create admin user if none exists"""
     # Check if admin already exists
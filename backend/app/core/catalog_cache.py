@@ -0,0 +1,320 @@
+# backend/app/core/catalog_cache.py
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import anyio.to_thread
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.translation import TranslationService
+from app.database import engine
+from app.models.category import Category, CategoryRead
+from app.models.product import Product, ProductRead
+
+
+# Columns products can be listed in order of
+SORT_FIELDS = ("name", "price", "created_at")
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CatalogSnapshot:
+    """
+    Read-only copy of the product catalog and categories at a given version
+
+    Derived views (translations, sort orders, pre-rendered JSON, content
+    hashes) are built on first use and reused until the snapshot is
+    replaced.
+    """
+
+    def __init__(self, version: int, products: List[ProductRead], categories: List[CategoryRead]):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.products = products
+        self.by_id = {product.id: product for product in products}
+        self.categories = categories
+        self.categories_by_id = {category.id: category for category in categories}
+        self._views: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+
+    def _memoize(self, key: Any, build: Callable[[], Any]) -> Any:
+        value = self._views.get(key)
+        if value is None:
+            with self._lock:
+                value = self._views.get(key)
+                if value is None:
+                    value = build()
+                    self._views[key] = value
+        return value
+
+    @staticmethod
+    def _language(language: str) -> str:
+        # Unsupported languages get the untranslated rows
+        return language if language in TranslationService.SUPPORTED_LANGUAGES else ''
+
+    def translated(self, language: str) -> Dict[int, ProductRead]:
+        """Get the products translated to a language, keyed by product ID"""
+        language = self._language(language)
+        return self._memoize(("products", language), lambda: {
+            product.id: TranslationService.translate_read_model(product, language)
+            for product in self.products
+        })
+
+    def translated_categories(self, language: str) -> Dict[int, CategoryRead]:
+        """Get the categories translated to a language, keyed by category ID"""
+        language = self._language(language)
+        return self._memoize(("categories", language), lambda: {
+            category.id: TranslationService.translate_read_model(category, language)
+            for category in self.categories
+        })
+
+    def prepare(self) -> None:
+        """
+        Build the views most requests need: the default language rendering,
+        content hashes and sort orders
+
+        Slow for large catalogs, so it runs in a worker thread.
+        """
+        self.product_json(TranslationService.DEFAULT_LANGUAGE)
+        self.category_json(TranslationService.DEFAULT_LANGUAGE)
+        self.fingerprint
+        self.category_fingerprint
+        for field in SORT_FIELDS:
+            self.sorted_by(field)
+        self.search_text
+
+    async def product_json_async(self, language: str) -> Dict[int, bytes]:
+        """`product_json`, rendered in a worker thread if it isn't built yet"""
+        rendered = self._views.get(("product_json", self._language(language)))
+        if rendered is None:
+            rendered = await anyio.to_thread.run_sync(self.product_json, language)
+        return rendered
+
+    async def category_json_async(self, language: str) -> Dict[int, bytes]:
+        """`category_json`, rendered in a worker thread if it isn't built yet"""
+        rendered = self._views.get(("category_json", self._language(language)))
+        if rendered is None:
+            rendered = await anyio.to_thread.run_sync(self.category_json, language)
+        return rendered
+
+    def product_json(self, language: str) -> Dict[int, bytes]:
+        """Get each translated product rendered as JSON, keyed by product ID"""
+        language = self._language(language)
+        return self._memoize(("product_json", language), lambda: {
+            product_id: product.model_dump_json().encode()
+            for product_id, product in self.translated(language).items()
+        })
+
+    def category_json(self, language: str) -> Dict[int, bytes]:
+        """Get each translated category rendered as JSON, keyed by category ID"""
+        language = self._language(language)
+        return self._memoize(("category_json", language), lambda: {
+            category_id: category.model_dump_json().encode()
+            for category_id, category in self.translated_categories(language).items()
+        })
+
+    def sorted_by(self, sort_by: str) -> List[ProductRead]:
+        """Get the untranslated products in ascending order of a column"""
+        return self._memoize(("sorted", sort_by), lambda: sorted(
+            self.products, key=lambda product: getattr(product, sort_by)
+        ))
+
+    @property
+    def search_text(self) -> Dict[int, str]:
+        """Lower-cased names and descriptions of each product in every language, keyed by product ID"""
+        return self._memoize("search_text", lambda: {
+            product.id: "\n".join(
+                value for value in (
+                    product.name,
+                    product.description,
+                    *(product.name_translations or {}).values(),
+                    *(product.description_translations or {}).values(),
+                ) if value
+            ).lower()
+            for product in self.products
+        })
+
+    @property
+    def digests(self) -> Dict[int, str]:
+        """Content hash of each product, keyed by product ID"""
+        return self._memoize("digests", lambda: {
+            product_id: _digest(data) for product_id, data in self.product_json('').items()
+        })
+
+    @property
+    def category_digests(self) -> Dict[int, str]:
+        """Content hash of each category, keyed by category ID"""
+        return self._memoize("category_digests", lambda: {
+            category_id: _digest(data) for category_id, data in self.category_json('').items()
+        })
+
+    def update_products(self, changes: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Apply field changes (e.g. stock levels) to products in place
+
+        Patches the products and the views already built from them, so a
+        change that doesn't affect translations or sort orders doesn't cost
+        a rebuild of the whole snapshot.
+        """
+        with self._lock:
+            changed = [product_id for product_id in changes if product_id in self.by_id]
+            for product_id in changed:
+                for field, value in changes[product_id].items():
+                    setattr(self.by_id[product_id], field, value)
+
+            for key, view in list(self._views.items()):
+                if not isinstance(key, tuple) or key[0] != "products":
+                    continue
+                language = key[1]
+                for product_id in changed:
+                    translated = view[product_id]
+                    if translated is not self.by_id[product_id]:
+                        for field, value in changes[product_id].items():
+                            setattr(translated, field, value)
+                rendered = self._views.get(("product_json", language))
+                if rendered is not None:
+                    for product_id in changed:
+                        rendered[product_id] = view[product_id].model_dump_json().encode()
+
+            digests = self._views.get("digests")
+            if digests is not None:
+                rendered = self._views[("product_json", "")]
+                for product_id in changed:
+                    digests[product_id] = _digest(rendered[product_id])
+                self._views["fingerprint"] = _digest("".join(digests.values()).encode())
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Content hash of all products
+
+        Unlike `version` it is the same in every worker process, so it can
+        back HTTP validators.
+        """
+        return self._memoize("fingerprint", lambda: _digest("".join(self.digests.values()).encode()))
+
+    @property
+    def category_fingerprint(self) -> str:
+        """Content hash of all categories"""
+        return self._memoize(
+            "category_fingerprint", lambda: _digest("".join(self.category_digests.values()).encode())
+        )
+
+
+class CatalogCache:
+    """
+    In-process catalog cache (products and categories)
+
+    The whole catalog is loaded once and served from memory until a write
+    invalidates it. Writers must call `invalidate()` (or `update_products()`
+    for stock-only changes) after committing.
+    """
+
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._async_build_lock = asyncio.Lock()
+        # Product changes made while a snapshot is loading (None when idle)
+        self._pending_changes: Optional[List[Dict[int, Dict[str, Any]]]] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next read rebuilds it"""
+        with self._build_lock:
+            self._version += 1
+            self._snapshot = None
+
+    def update_products(self, changes: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Patch committed changes to a few product fields into the snapshot
+
+        For writes that don't touch names, translations, categories or sort
+        keys (e.g. stock levels after a checkout); anything else must
+        `invalidate()`. Changes committed while a snapshot is being loaded
+        are applied to it once it is built.
+        """
+        with self._build_lock:
+            if self._pending_changes is not None:
+                self._pending_changes.append(changes)
+            snapshot = self._snapshot
+        if snapshot is not None:
+            snapshot.update_products(changes)
+
+    def _is_fresh(self, snapshot: Optional[CatalogSnapshot]) -> bool:
+        if snapshot is None or snapshot.version != self._version:
+            return False
+        if self.ttl_seconds and time.monotonic() - snapshot.built_at > self.ttl_seconds:
+            return False
+        return True
+
+    @staticmethod
+    def _build(version: int, products: Sequence[Product], categories: Sequence[Category]) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(
+            version=version,
+            products=[ProductRead.model_validate(product) for product in products],
+            categories=[CategoryRead.model_validate(category) for category in categories],
+        )
+        snapshot.prepare()
+        return snapshot
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        """Get the current snapshot without touching the database, or None if stale"""
+        snapshot = self._snapshot
+        return snapshot if self._is_fresh(snapshot) else None
+
+    def _load(self, version: int) -> CatalogSnapshot:
+        with Session(engine) as session:
+            return self._build(
+                version,
+                session.exec(select(Product).order_by(Product.id)).all(),
+                session.exec(select(Category).order_by(Category.id)).all(),
+            )
+
+    async def get_snapshot_async(self) -> CatalogSnapshot:
+        """
+        Get the current catalog snapshot, loading it from the database if needed
+
+        Concurrent misses wait on an asyncio lock, and the catalog is loaded
+        and prepared in a worker thread (ORM loading and rendering are CPU
+        bound), so the event loop is never blocked while it rebuilds.
+        """
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+
+        async with self._async_build_lock:
+            snapshot = self.peek()
+            if snapshot is not None:
+                return snapshot
+
+            with self._build_lock:
+                version = self._version
+                self._pending_changes = []
+            try:
+                snapshot = await anyio.to_thread.run_sync(self._load, version)
+            except BaseException:
+                with self._build_lock:
+                    self._pending_changes = None
+                raise
+
+            with self._build_lock:
+                for changes in self._pending_changes:
+                    snapshot.update_products(changes)
+                self._pending_changes = None
+                # An invalidation during the load leaves the version behind,
+                # so the snapshot is simply treated as stale by the next reader
+                self._snapshot = snapshot
+            return snapshot
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
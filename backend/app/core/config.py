@@ -25,15 +25,92 @@ class Settings(BaseSettings):
 
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    # Async engine for the catalog read endpoints (derived from DATABASE_URL
+    # with the aiosqlite/asyncpg driver unless set explicitly)
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+
+    # Connection pool settings (server databases such as PostgreSQL)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # PostgreSQL session settings (0 disables the statement timeout)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # Server-side prepared statements: false turns them off for asyncpg and
+    # psycopg 3, e.g. behind PgBouncer in transaction mode (psycopg2 never
+    # prepares). The threshold is the number of executions after which
+    # psycopg 3 prepares a statement; asyncpg prepares every statement.
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    DB_PREPARE_THRESHOLD: Optional[int] = (
+        int(os.environ["DB_PREPARE_THRESHOLD"]) if os.getenv("DB_PREPARE_THRESHOLD") else None
+    )
+
+    # SQLite performance profile (WAL journal, pragmas applied on connect and
+    # a single in-process writer queue)
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))
+    SQLITE_SERIALIZE_WRITES: bool = os.getenv("SQLITE_SERIALIZE_WRITES", "true").lower() == "true"
+    
+    # Metrics endpoint (/metrics): when a token is set, scrapers must send it
+    # as "Authorization: Bearer <token>"
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+    
+    # Query instrumentation: statements slower than this are logged (0
+    # disables it), and each response carries its query count and DB time
+    # in X-DB-Queries / X-DB-Time (milliseconds) when headers are enabled
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    DB_QUERY_HEADERS: bool = os.getenv("DB_QUERY_HEADERS", "true").lower() == "true"
+    # Requests running more statements than this are logged as likely N+1
+    # patterns (0 disables it)
+    REQUEST_QUERY_WARN_COUNT: int = int(os.getenv("REQUEST_QUERY_WARN_COUNT", "30"))
+    
+    # Request profiling: 1 in PROFILE_SAMPLE_RATE requests of each route is
+    # profiled (0 disables sampling; admins can always ask for a profile),
+    # and the newest PROFILE_MAX_FILES profiles are kept in PROFILE_DIR
+    PROFILE_SAMPLE_RATE: int = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "200"))
+    PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.001"))  # seconds, pyinstrument only
+    
+    # Development server (`python main.py`): restart on code changes
+    RELOAD: bool = os.getenv("RELOAD", "false").lower() == "true"
     
     # Security settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-make-it-very-secure-and-very-long")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
     
+    # Password hashing: bcrypt cost and the dedicated worker pool
+    # (raising BCRYPT_ROUNDS rehashes existing passwords on next login)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+    
+    # Authenticated user cache (0 size disables it). User changes reach
+    # every worker of the same gunicorn master at once; other processes
+    # (e.g. on other hosts) keep cached users for up to the TTL
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    
     # Admin user settings
     ADMIN_EMAIL: str = os.getenv("ADMIN_EMAIL", "admin@freshproduce.com")
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD", "admin123")
     ADMIN_NAME: str = os.getenv("ADMIN_NAME", "Admin User")
 
+    # Catalog cache settings
+    # Writes invalidate the cache of the process that handled them; the TTL
+    # bounds how stale other worker processes can get (0 disables it)
+    CATALOG_CACHE_TTL_SECONDS: int = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+    # HTTP caching of catalog responses (Cache-Control max-age, in seconds);
+    # clients revalidate with ETags once it expires
+    PRODUCTS_HTTP_MAX_AGE: int = int(os.getenv("PRODUCTS_HTTP_MAX_AGE", "30"))
+    CATEGORIES_HTTP_MAX_AGE: int = int(os.getenv("CATEGORIES_HTTP_MAX_AGE", "300"))
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,320 @@
+# backend/app/core/metrics.py
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import anyio.to_thread
+import sniffio
+from fastapi.routing import iter_route_contexts
+from starlette.routing import BaseRoute
+
+from app.core.security import password_pool
+from app.database import get_pool_stats, pool_stats, sqlite_write_queue_stats
+
+# Request latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+# Statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base class: a named family of samples keyed by label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, LabelValues, Sequence[str], float]]:
+        """(sample name, label values, extra label names/values, value) tuples"""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, values, extra, value in self.samples():
+            labels = _format_labels(self.labelnames + tuple(extra[::2]), values + tuple(extra[1::2]))
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """Mirror a lifetime total that is counted elsewhere"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets, plus their sum and count"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: [count per bucket..., sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+
+        samples = []
+        for key, state in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key, ("le", _format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", key, (), state[-1]))
+            samples.append((f"{self.name}_count", key, (), cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    In-process metrics in the Prometheus text format
+
+    Metrics are per process: behind gunicorn each worker keeps its own
+    registry, so scrape the workers individually or aggregate by instance.
+    Collectors registered with `add_collector` run before each render to
+    refresh gauges that are sampled rather than updated as events happen.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Run the collectors and format every metric for a scrape"""
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# Full path template of each route, keyed by route object
+_route_templates: Dict[int, str] = {}
+
+
+def route_template(routes: Sequence[BaseRoute], route: BaseRoute) -> str:
+    """
+    Get the path template a request was routed to, e.g. /api/v1/products/{product_id}
+
+    Included routers keep their routes' own paths (without the prefix), so
+    the full templates are resolved once from the application's routes.
+    """
+    if not _route_templates:
+        for context in iter_route_contexts(routes):
+            _route_templates[id(context.original_route)] = context.path_format or ""
+    return _route_templates.get(id(route)) or getattr(route, "path", "unmatched")
+
+# HTTP requests, labelled with the route template (e.g. /api/v1/products/{product_id})
+http_requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "http_request_duration_seconds", "Time to produce the response headers", ("method", "route")
+)
+http_requests_in_progress = metrics.gauge(
+    # By method only: the route is not known until the request has been routed
+    "http_requests_in_progress", "HTTP requests being handled", ("method",)
+)
+
+# Database work done by each request
+http_request_db_queries = metrics.histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = metrics.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ("method", "route")
+)
+
+# Sampled at scrape time
+threadpool_threads = metrics.gauge(
+    "threadpool_threads", "Threads of the pool running sync endpoints and dependencies", ("state",)
+)
+threadpool_tasks_waiting = metrics.gauge(
+    "threadpool_tasks_waiting", "Sync calls waiting for a free thread"
+)
+password_pool_threads = metrics.gauge(
+    "password_pool_threads", "Threads of the password hashing pool", ("state",)
+)
+password_pool_tasks_queued = metrics.gauge(
+    "password_pool_tasks_queued", "Password hashing calls waiting for a thread"
+)
+password_pool_rejected_total = metrics.counter(
+    "password_pool_rejected_total", "Password hashing calls rejected because the queue was full"
+)
+db_pool_connections = metrics.gauge(
+    "db_pool_connections", "Connections of the database pool", ("state",)
+)
+db_pool_checkouts_total = metrics.counter(
+    "db_pool_checkouts_total", "Connections checked out of the database pool"
+)
+db_pool_timeouts_total = metrics.counter(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection"
+)
+db_pool_wait_seconds_total = metrics.counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a pooled connection"
+)
+db_sqlite_write_queue_wait_seconds_total = metrics.counter(
+    "db_sqlite_write_queue_wait_seconds_total", "Time write transactions spent waiting for the SQLite writer queue"
+)
+db_sqlite_write_queue_timeouts_total = metrics.counter(
+    "db_sqlite_write_queue_timeouts_total", "Write transactions that timed out waiting for the SQLite writer queue"
+)
+
+
+def collect_runtime() -> None:
+    """Sample thread pool and connection pool saturation"""
+    try:
+        # Only available on the event loop (i.e. when rendered by the endpoint)
+        sniffio.current_async_library()
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except sniffio.AsyncLibraryNotFoundError:
+        limiter = None
+    if limiter is not None:
+        threadpool_threads.set(limiter.total_tokens, state="max")
+        threadpool_threads.set(limiter.borrowed_tokens, state="busy")
+        threadpool_tasks_waiting.set(limiter.statistics().tasks_waiting)
+
+    passwords = password_pool.stats()
+    password_pool_threads.set(passwords["max_workers"], state="max")
+    password_pool_threads.set(passwords["active"], state="busy")
+    password_pool_tasks_queued.set(passwords["queued"])
+    password_pool_rejected_total.set_total(passwords["rejected"])
+
+    pool = get_pool_stats()
+    if "size" in pool:
+        db_pool_connections.set(pool["size"], state="size")
+        db_pool_connections.set(pool["checked_out"], state="checked_out")
+        db_pool_connections.set(pool["checked_in"], state="checked_in")
+        db_pool_connections.set(max(pool["overflow"], 0), state="overflow")
+    db_pool_checkouts_total.set_total(pool_stats.checkouts)
+    db_pool_timeouts_total.set_total(pool_stats.timeouts)
+    db_pool_wait_seconds_total.set_total(pool_stats.wait_seconds)
+    db_sqlite_write_queue_wait_seconds_total.set_total(sqlite_write_queue_stats.wait_seconds)
+    db_sqlite_write_queue_timeouts_total.set_total(sqlite_write_queue_stats.timeouts)
+
+
+metrics.add_collector(collect_runtime)
@@ -0,0 +1,304 @@
+# backend/app/core/profiling.py
+"""
+Per-request profiling
+
+Admins profile a single request by sending `X-Profile: store` (or
+`?profile=store`): the response is unchanged and carries an X-Profile-Id
+to download the profile with. `X-Profile: return` replaces the response
+body with the profile itself. With PROFILE_SAMPLE_RATE set, 1 in N requests
+of every route is profiled into the store as well.
+
+One request is profiled at a time. While one is, `store` requests are
+served unprofiled with `X-Profile-Status: busy`, and `return` requests get
+a 429.
+
+Profiles are recorded with pyinstrument when it is installed and saved in
+the speedscope format (open them at https://www.speedscope.app). Without it
+cProfile is used and profiles are pstats files (snakeviz, flameprof).
+"""
+import cProfile
+import functools
+import inspect
+import itertools
+import json
+import marshal
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import route_template
+from app.core.security import get_current_admin_user, get_current_user, oauth2_scheme
+from app.database import engine
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    from pyinstrument.session import Session as ProfilerSession
+except ImportError:
+    Profiler = None
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_MODES = ("store", "return")
+# Set to "busy" on requests that asked for a profile while another request
+# was being profiled
+PROFILE_STATUS_HEADER = "X-Profile-Status"
+
+# Profile of the request being handled, seen by the sync endpoint it runs
+# in the threadpool
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+# One profiled request at a time per process keeps the overhead bounded and
+# stops cProfile sessions from replacing each other on the event loop
+_profiling = threading.Lock()
+
+
+class RequestProfile:
+    """Profilers started for one request, one per thread it ran on"""
+
+    backend = "pyinstrument" if Profiler is not None else "cprofile"
+    extension = ".speedscope.json" if Profiler is not None else ".prof"
+    media_type = "application/json" if Profiler is not None else "application/octet-stream"
+
+    def __init__(self):
+        self._profilers: List[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile_thread(self, on_event_loop: bool = False) -> Iterator[None]:
+        """Profile the current thread for the duration of the block"""
+        if Profiler is not None:
+            # On the event loop only this request's task is profiled; time
+            # it spends awaiting shows up as [await]
+            profiler = Profiler(
+                interval=settings.PROFILE_INTERVAL,
+                async_mode="enabled" if on_event_loop else "disabled",
+            )
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+        else:
+            # cProfile records everything that runs on the thread, including
+            # other requests' tasks on the event loop
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        with self._lock:
+            self._profilers.append(profiler)
+
+    def render(self) -> bytes:
+        """Combine the threads' profiles into a single file"""
+        with self._lock:
+            profilers = list(self._profilers)
+        if Profiler is not None:
+            session = functools.reduce(
+                ProfilerSession.combine, [profiler.last_session for profiler in profilers]
+            )
+            return SpeedscopeRenderer().render(session).encode()
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return marshal.dumps(stats.stats)
+
+
+class ProfileStore:
+    """
+    Profiles on disk, keeping the most recent `max_files`
+
+    Every profile is a data file plus a JSON file describing the request.
+    Worker processes can share the directory.
+    """
+
+    _id_pattern = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{12}$")
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, data: bytes, extension: str, meta: Dict[str, Any]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        # Sortable by creation time
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:12]}"
+        meta = {"id": profile_id, "filename": f"{profile_id}{extension}", **meta}
+        with open(os.path.join(self.directory, meta["filename"]), "wb") as file:
+            file.write(data)
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as file:
+            json.dump(meta, file)
+        self._rotate()
+        return profile_id
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json") and self._id_pattern.match(name[:-5]))
+
+    def _rotate(self) -> None:
+        ids = self._ids()
+        expired = set(ids[:max(len(ids) - self.max_files, 0)])
+        if not expired:
+            return
+        for name in os.listdir(self.directory):
+            if name.split(".", 1)[0] in expired:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    # Removed by another worker
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Descriptions of the stored profiles, newest first"""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            meta = self.get(profile_id)
+            if meta is not None:
+                profiles.append(meta[0])
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Description and data file path of a profile"""
+        if not self._id_pattern.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.json")) as file:
+                meta = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+        path = os.path.join(self.directory, meta["filename"])
+        return (meta, path) if os.path.exists(path) else None
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+
+
+def _check_admin(token: str) -> str:
+    with Session(engine) as session:
+        return get_current_admin_user(get_current_user(token, session)).email
+
+
+async def requested_profile_mode(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Profiling mode asked for by the request and the admin who asked
+
+    Raises 401/403 like `get_current_admin_user` when the caller is not an
+    admin, and 400 for an unknown mode.
+    """
+    mode = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile")
+    if not mode:
+        return None, None
+    if mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"{PROFILE_HEADER} must be one of {', '.join(PROFILE_MODES)}")
+    token = await oauth2_scheme(request)
+    email = await run_in_threadpool(_check_admin, token)
+    return mode, email
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route that can profile its requests
+
+    The route handler (dependencies, endpoint, serialization) is profiled on
+    the event loop. Sync endpoints run in the threadpool, where a wrapper
+    profiles them too.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if inspect.isfunction(endpoint) and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _profile_sync_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+        self._request_counter = itertools.count(1)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            mode, requested_by = await requested_profile_mode(request)
+            trigger = "request"
+            sample_rate = settings.PROFILE_SAMPLE_RATE
+            if mode is None and sample_rate and next(self._request_counter) % sample_rate == 0:
+                mode, trigger = "store", "sample"
+            if mode is None:
+                return await handler(request)
+            if not _profiling.acquire(blocking=False):
+                if trigger == "sample":
+                    return await handler(request)
+                if mode == "return":
+                    # The caller wants the profile instead of the response,
+                    # so don't run the request without one
+                    raise HTTPException(
+                        status_code=429,
+                        detail="Another request is being profiled, please retry shortly",
+                        headers={"Retry-After": "1", PROFILE_STATUS_HEADER: "busy"},
+                    )
+                response = await handler(request)
+                response.headers[PROFILE_STATUS_HEADER] = "busy"
+                return response
+
+            profile = RequestProfile()
+            token = current_profile.set(profile)
+            started = time.perf_counter()
+            try:
+                with profile.profile_thread(on_event_loop=True):
+                    response = await handler(request)
+            finally:
+                current_profile.reset(token)
+                _profiling.release()
+            duration = time.perf_counter() - started
+
+            data = await run_in_threadpool(profile.render)
+            meta = {
+                "method": request.method,
+                "route": route_template(request.app.routes, self),
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "trigger": trigger,
+                "requested_by": requested_by,
+                "backend": profile.backend,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if mode == "return":
+                filename = f"profile-{request.method.lower()}-{meta['status']}{profile.extension}"
+                return Response(
+                    content=data,
+                    media_type=profile.media_type,
+                    headers={
+                        "Content-Disposition": f'attachment; filename="{filename}"',
+                        "X-Profiled-Status": str(response.status_code),
+                    },
+                )
+            profile_id = await run_in_threadpool(profile_store.save, data, profile.extension, meta)
+            response.headers["X-Profile-Id"] = profile_id
+            return response
+
+        return profiled_handler
+
+
+def _profile_sync_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile = current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        with profile.profile_thread():
+            return endpoint(*args, **kwargs)
+
+    return wrapper
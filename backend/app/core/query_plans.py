@@ -0,0 +1,108 @@
+# backend/app/core/query_plans.py
+import logging
+import re
+import sys
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.sql import Select
+from sqlmodel import Session, select
+
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Queries on hot paths that must be answered from an index. Parameter values
+# are placeholders: only the shape of the query matters to the planner.
+HOT_QUERIES: Dict[str, Callable[[], Select]] = {
+    "customer orders (newest first)": lambda: select(Order)
+        .where(Order.user_id == 1)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(100),
+    "all orders (newest first)": lambda: select(Order)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(100),
+    "items of an order": lambda: select(OrderItem).where(OrderItem.order_id == 1),
+    "order items of a product": lambda: select(OrderItem.id).where(OrderItem.product_id == 1),
+    "products of a category": lambda: select(Product.id).where(Product.category_id == 1),
+    "low stock products": lambda: select(Product.id)
+        .where(Product.stock_quantity <= 10, Product.is_active == True)
+        .order_by(Product.stock_quantity),
+    "user by email": lambda: select(User).where(User.email == "someone@example.com"),
+}
+
+# Plan lines that mean a query reads a whole table (or sorts it) on SQLite
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN \w+$|USE TEMP B-TREE FOR ORDER BY")
+
+# Backends whose query plans can be checked
+SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+
+
+def explain(session: Session, statement: Select) -> List[str]:
+    """Get the query plan of a statement, one line per plan node"""
+    dialect = session.get_bind().dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+    if dialect.name == "sqlite":
+        return [row[-1] for row in session.exec(text(f"EXPLAIN QUERY PLAN {sql}")).all()]
+    if dialect.name == "postgresql":
+        return [row[0] for row in session.exec(text(f"EXPLAIN {sql}")).all()]
+    raise NotImplementedError(f"Query plans are not supported on {dialect.name}")
+
+
+def check_query_plans(session: Session) -> Optional[Dict[str, List[str]]]:
+    """
+    Explain every hot query and report the ones that need a full scan
+
+    Returns the offending plan lines keyed by query name (empty when every
+    query uses an index), or None when the backend's plans can't be checked.
+    On PostgreSQL sequential scans are disabled for the check, since the
+    planner rightly prefers them on small tables; one showing up anyway
+    means there is no usable index.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect not in SUPPORTED_DIALECTS:
+        logger.warning(f"Query plans can't be checked on {dialect}, skipping")
+        return None
+    if dialect == "postgresql":
+        session.exec(text("SET LOCAL enable_seqscan = off"))
+
+    problems: Dict[str, List[str]] = {}
+    for name, build in HOT_QUERIES.items():
+        plan = explain(session, build())
+        logger.info(f"{name}:\n  " + "\n  ".join(plan))
+
+        if dialect == "postgresql":
+            offending = [line for line in plan if "Seq Scan" in line]
+        else:
+            offending = [line for line in plan if _SQLITE_FULL_SCAN.search(line.strip())]
+        if offending:
+            problems[name] = offending
+
+    session.rollback()
+    return problems
+
+
+if __name__ == "__main__":
+    from app.database import engine, schema_revisions
+    # Register the remaining models so every relationship can be resolved
+    from app.models import category  # noqa: F401
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Read-only: the indexes are checked as the migrations left them
+    current, head = schema_revisions()
+    if current != head:
+        logger.error(f"The database schema is at revision {current}, not {head}; run `python -m app.init_db` first")
+        sys.exit(2)
+
+    with Session(engine) as session:
+        problems = check_query_plans(session)
+
+    if problems is None:
+        sys.exit(0)
+    for name, lines in problems.items():
+        logger.error(f"Full scan in '{name}': {'; '.join(lines)}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,172 @@
+# backend/app/core/rollups.py
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select, func
+
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.models.sales_rollup import DailyOrderSales, DailyProductSales, DailyCategorySales
+
+logger = logging.getLogger(__name__)
+
+# (product_id, category_id, quantity, revenue) for one order line
+OrderLine = Tuple[int, Optional[int], float, float]
+
+
+class SalesRollups:
+    """
+    Daily sales aggregates maintained alongside the orders
+
+    Order writes apply their deltas in the same transaction, so the
+    dashboard and sales report can read a handful of pre-aggregated rows
+    instead of scanning the order history.
+    """
+
+    @staticmethod
+    def _dialect(session: Session) -> str:
+        return session.get_bind().dialect.name
+
+    def _upsert(self, session: Session, model, keys: List[str], rows: List[Dict]) -> None:
+        """Add the value columns of each row to the existing aggregate (or create it)"""
+        if not rows:
+            return
+
+        insert_for = postgresql_insert if self._dialect(session) == "postgresql" else sqlite_insert
+        statement = insert_for(model)
+        values = [column for column in rows[0] if column not in keys]
+        statement = statement.on_conflict_do_update(
+            index_elements=keys,
+            set_={column: getattr(model, column) + statement.excluded[column] for column in values},
+        )
+        session.exec(statement, params=rows)
+
+    def _apply_lines(self, session: Session, day: date, lines: Iterable[OrderLine], sign: int) -> None:
+        products: Dict[int, List[float]] = defaultdict(lambda: [0, 0])
+        categories: Dict[int, List[float]] = defaultdict(lambda: [0, 0])
+        for product_id, category_id, quantity, revenue in lines:
+            products[product_id][0] += quantity
+            products[product_id][1] += revenue
+            if category_id is not None:
+                categories[category_id][0] += quantity
+                categories[category_id][1] += revenue
+
+        self._upsert(session, DailyProductSales, ["day", "product_id"], [
+            {"day": day, "product_id": product_id, "quantity": sign * quantity, "revenue": sign * revenue}
+            for product_id, (quantity, revenue) in products.items()
+        ])
+        self._upsert(session, DailyCategorySales, ["day", "category_id"], [
+            {"day": day, "category_id": category_id, "quantity": sign * quantity, "revenue": sign * revenue}
+            for category_id, (quantity, revenue) in categories.items()
+        ])
+
+    def _apply_order(self, session: Session, day: date, status: OrderStatus, revenue: float, sign: int) -> None:
+        self._upsert(session, DailyOrderSales, ["day", "status"], [
+            {"day": day, "status": status, "order_count": sign, "revenue": sign * revenue}
+        ])
+
+    @staticmethod
+    def _order_lines(session: Session, order_id: int) -> List[OrderLine]:
+        return session.exec(
+            select(
+                OrderItem.product_id,
+                Product.category_id,
+                OrderItem.quantity,
+                OrderItem.quantity * OrderItem.unit_price,
+            ).outerjoin(
+                Product, OrderItem.product_id == Product.id
+            ).where(OrderItem.order_id == order_id)
+        ).all()
+
+    def record_order(self, session: Session, order: Order, lines: Iterable[OrderLine]) -> None:
+        """Count a newly created order, in the caller's transaction"""
+        day = order.created_at.date()
+        self._apply_order(session, day, order.status, order.total_amount, 1)
+        if order.status != OrderStatus.CANCELLED:
+            self._apply_lines(session, day, lines, 1)
+
+    def record_status_change(self, session: Session, order: Order, previous_status: OrderStatus) -> None:
+        """Move an order between status aggregates, in the caller's transaction"""
+        if order.status == previous_status:
+            return
+
+        day = order.created_at.date()
+        self._apply_order(session, day, previous_status, order.total_amount, -1)
+        self._apply_order(session, day, order.status, order.total_amount, 1)
+
+        # Product and category sales only count orders that aren't cancelled
+        if OrderStatus.CANCELLED in (order.status, previous_status):
+            sign = -1 if order.status == OrderStatus.CANCELLED else 1
+            self._apply_lines(session, day, self._order_lines(session, order.id), sign)
+
+    def rebuild(self, session: Session) -> None:
+        """Recompute every aggregate from the orders tables"""
+        if self._dialect(session) == "postgresql":
+            day = cast(Order.created_at, Date)
+        else:
+            day = func.date(Order.created_at)
+
+        for model in (DailyOrderSales, DailyProductSales, DailyCategorySales):
+            session.exec(delete(model))
+
+        session.exec(insert(DailyOrderSales).from_select(
+            ["day", "status", "order_count", "revenue"],
+            select(day, Order.status, func.count(), func.sum(Order.total_amount))
+            .group_by(day, Order.status),
+        ))
+
+        line_revenue = OrderItem.quantity * OrderItem.unit_price
+        active_lines = select(OrderItem).join(
+            Order, OrderItem.order_id == Order.id
+        ).where(Order.status != OrderStatus.CANCELLED)
+
+        session.exec(insert(DailyProductSales).from_select(
+            ["day", "product_id", "quantity", "revenue"],
+            active_lines.with_only_columns(
+                day, OrderItem.product_id, func.sum(OrderItem.quantity), func.sum(line_revenue)
+            ).group_by(day, OrderItem.product_id),
+        ))
+
+        session.exec(insert(DailyCategorySales).from_select(
+            ["day", "category_id", "quantity", "revenue"],
+            active_lines.join(
+                Product, OrderItem.product_id == Product.id
+            ).with_only_columns(
+                day, Product.category_id, func.sum(OrderItem.quantity), func.sum(line_revenue)
+            ).group_by(day, Product.category_id),
+        ))
+
+        session.commit()
+        logger.info("Sales rollups rebuilt")
+
+    def ensure_rollups(self, session: Session) -> None:
+        """Backfill the aggregates if they are empty but orders exist"""
+        has_rollups = session.exec(select(DailyOrderSales.day).limit(1)).first() is not None
+        has_orders = session.exec(select(Order.id).limit(1)).first() is not None
+        if has_orders and not has_rollups:
+            self.rebuild(session)
+
+
+sales_rollups = SalesRollups()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import engine
+    # Register the remaining models so every relationship can be resolved
+    from app.models import category, user  # noqa: F401
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Maintain the daily sales rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    with Session(engine) as session:
+        sales_rollups.rebuild(session)
@@ -0,0 +1,210 @@
+# backend/app/core/search.py
+import logging
+import re
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlmodel import Session, select
+
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+
+class ProductSearchIndex:
+    """
+    Full-text index over product names and descriptions in every language
+
+    Uses an FTS5 virtual table on SQLite and a tsvector column with a GIN
+    index on PostgreSQL, both created by the migrations and filled by
+    `python -m app.init_db`. On any other backend (or a SQLite build without
+    FTS5) the index is unavailable and `search` returns None so callers can
+    fall back to a plain scan.
+    """
+
+    SQLITE_TABLE = "products_fts"
+    POSTGRES_TABLE = "product_search"
+
+    def __init__(self):
+        # Per dialect: True once the index has been found, False when this
+        # backend can't have one
+        self._available: Dict[str, bool] = {}
+        self._warned_missing = False
+
+    @staticmethod
+    def _dialect(session: Session) -> str:
+        return session.get_bind().dialect.name
+
+    def is_available(self, session: Session) -> bool:
+        """
+        Whether the index exists
+
+        Worker processes look for the table the migrations created when they
+        first need it. A missing table is looked for again on the next call,
+        so the index is picked up as soon as it has been created.
+        """
+        dialect = self._dialect(session)
+        available = self._available.get(dialect)
+        if available is not None:
+            return available
+
+        if dialect == "sqlite":
+            available = session.exec(
+                text("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                params={"name": self.SQLITE_TABLE},
+            ).one()[0] > 0
+        elif dialect == "postgresql":
+            available = session.exec(
+                text("SELECT to_regclass(:name) IS NOT NULL"), params={"name": self.POSTGRES_TABLE}
+            ).one()[0]
+        else:
+            self._available[dialect] = False
+            return False
+
+        if available:
+            self._available[dialect] = True
+        elif not self._warned_missing:
+            self._warned_missing = True
+            logger.warning(
+                "The product search index is missing (run `python -m app.init_db`; "
+                "SQLite needs FTS5), using a plain scan"
+            )
+        return available
+
+    @staticmethod
+    def _documents(product: Product) -> Dict[str, str]:
+        """Build the indexed text: the default value plus every translation"""
+        names = [product.name, *(product.name_translations or {}).values()]
+        descriptions = [product.description, *(product.description_translations or {}).values()]
+        return {
+            "name": " ".join(value for value in names if value),
+            "description": " ".join(value for value in descriptions if value),
+        }
+
+    @staticmethod
+    def _tokens(term: str) -> List[str]:
+        return re.findall(r"\w+", term.lower())
+
+    def rebuild(self, session: Session) -> None:
+        """
+        Recompute the whole index from the products table
+
+        Run on every `python -m app.init_db`, so entries that went stale
+        (e.g. products changed directly in the database) are repaired.
+        """
+        if not self.is_available(session):
+            return
+
+        table = self.SQLITE_TABLE if self._dialect(session) == "sqlite" else self.POSTGRES_TABLE
+        session.exec(text(f"DELETE FROM {table}"))
+        self._insert(session, session.exec(select(Product)).all())
+        session.commit()
+        logger.info("Product search index rebuilt")
+
+    def index_product(self, session: Session, product: Product) -> None:
+        """
+        Add or refresh a product in the index
+
+        Runs in the caller's transaction so the index is committed together
+        with the product row.
+        """
+        if not self.is_available(session):
+            return
+
+        self.remove_product(session, product.id)
+        self._insert(session, [product])
+
+    def index_products(self, session: Session, products: Sequence[Product]) -> None:
+        """Add or refresh many products at once in the caller's transaction"""
+        if not self.is_available(session) or not products:
+            return
+
+        ids = [product.id for product in products]
+        if self._dialect(session) == "sqlite":
+            statement = text(f"DELETE FROM {self.SQLITE_TABLE} WHERE rowid IN :ids")
+        else:
+            statement = text(f"DELETE FROM {self.POSTGRES_TABLE} WHERE product_id IN :ids")
+        session.exec(statement.bindparams(bindparam("ids", expanding=True)), params={"ids": ids})
+        self._insert(session, products)
+
+    def _insert(self, session: Session, products: Sequence[Product]) -> None:
+        """Insert index entries for products that aren't indexed yet (one executemany)"""
+        if not products:
+            return
+
+        params = [{"id": product.id, **self._documents(product)} for product in products]
+        if self._dialect(session) == "sqlite":
+            session.exec(
+                text(
+                    f"INSERT INTO {self.SQLITE_TABLE} (rowid, name, description) "
+                    "VALUES (:id, :name, :description)"
+                ),
+                params=params,
+            )
+        else:
+            session.exec(
+                text(
+                    f"INSERT INTO {self.POSTGRES_TABLE} (product_id, document) VALUES (:id, "
+                    "setweight(to_tsvector('simple', :name), 'A') || "
+                    "setweight(to_tsvector('simple', :description), 'B'))"
+                ),
+                params=params,
+            )
+
+    def remove_product(self, session: Session, product_id: int) -> None:
+        """Remove a product from the index in the caller's transaction"""
+        if not self.is_available(session):
+            return
+
+        if self._dialect(session) == "sqlite":
+            session.exec(
+                text(f"DELETE FROM {self.SQLITE_TABLE} WHERE rowid = :id"),
+                params={"id": product_id},
+            )
+        else:
+            session.exec(
+                text(f"DELETE FROM {self.POSTGRES_TABLE} WHERE product_id = :id"),
+                params={"id": product_id},
+            )
+
+    def search(self, session: Session, term: str) -> Optional[List[int]]:
+        """
+        Find products matching every word of the search term (as prefixes)
+
+        Only whole words and word prefixes are indexed, so substrings inside
+        a word ("pple" in "Apples") are left to the caller.
+
+        Returns:
+            Product IDs ordered by relevance, or None if the index is unavailable
+        """
+        if not self.is_available(session):
+            return None
+
+        tokens = self._tokens(term)
+        if not tokens:
+            return []
+
+        if self._dialect(session) == "sqlite":
+            query = " ".join(f'"{token}"*' for token in tokens)
+            rows = session.exec(
+                text(
+                    f"SELECT rowid FROM {self.SQLITE_TABLE} WHERE {self.SQLITE_TABLE} MATCH :query "
+                    f"ORDER BY bm25({self.SQLITE_TABLE}, 10.0, 1.0)"
+                ),
+                params={"query": query},
+            ).all()
+        else:
+            query = " & ".join(f"{token}:*" for token in tokens)
+            rows = session.exec(
+                text(
+                    f"SELECT product_id FROM {self.POSTGRES_TABLE} "
+                    "WHERE document @@ to_tsquery('simple', :query) "
+                    "ORDER BY ts_rank(document, to_tsquery('simple', :query)) DESC"
+                ),
+                params={"query": query},
+            ).all()
+
+        return [row[0] for row in rows]
+
+
+product_search = ProductSearchIndex()
@@ -1,7 +1,15 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -11,18 +19,203 @@ from app.core.config import settings
 from app.models.user import User, UserRole
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
 
 # OAuth2 token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+class UserCache:
+    """
+    TTL + LRU cache of authenticated users keyed by token subject (email)
+
+    Only plain column values are kept (never the password hash), so each
+    request gets its own User instance attached to its own session.
+
+    Every process has its own entries, but invalidations are counted in
+    shared memory created before gunicorn forks its workers, so a user
+    changed on one worker is dropped from the others' caches on their next
+    lookup. Processes that don't share that memory (e.g. on other hosts)
+    pick changes up once their entries expire after `ttl_seconds`.
+    """
+
+    # Invalidation counters shared with forked workers; subjects are spread
+    # over the slots by a hash that is the same in every process
+    GENERATION_SLOTS = 4096
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generations = multiprocessing.Array("Q", self.GENERATION_SLOTS)
+
+    def _slot(self, subject: str) -> int:
+        return zlib.crc32(subject.encode()) % self.GENERATION_SLOTS
+
+    def generation(self, subject: str) -> int:
+        """
+        Invalidation counter of a user
+
+        Read it before loading the user and pass it to `set`, so a change
+        committed in between isn't cached.
+        """
+        return self._generations.get_obj()[self._slot(subject)]
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, generation, values = entry
+            if time.monotonic() >= expires_at or generation != self.generation(subject):
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return values
+
+    def set(self, subject: str, user: User, generation: int) -> None:
+        if self.max_size <= 0:
+            return
+        values = user.model_dump(exclude={"hashed_password"})
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, generation, values)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        """Forget a user in every worker, e.g. after their role or active flag changed"""
+        with self._generations.get_lock():
+            self._generations.get_obj()[self._slot(subject)] += 1
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+class PasswordWorkPool:
+    """
+    Bounded executor for bcrypt hashing and verification
+
+    bcrypt is deliberately slow, so running it on the request threads lets
+    a burst of logins occupy every worker thread. Password work runs on a
+    small dedicated pool instead, and when both the pool and its queue are
+    full new requests are rejected with 429 rather than piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+
+    def _call(self, submitted_at: float, fn: Callable, args: tuple) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_seconds += time.perf_counter() - submitted_at
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def _submit(self, fn: Callable, args: tuple) -> Future:
+        """Queue fn(*args) on the pool, or raise 429 when the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            with self._lock:
+                self._queued += 1
+            future = self._executor.submit(self._call, time.perf_counter(), fn, args)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        # The slot is held until the work is done, even if the caller stopped
+        # waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) on the pool and wait for the result"""
+        return self._submit(fn, args).result()
+
+    async def run_async(self, fn: Callable, *args: Any) -> Any:
+        """
+        Run fn(*args) on the pool and await the result
+
+        Unlike `run`, the caller doesn't hold a thread while it waits, so
+        async endpoints queueing here don't use up the AnyIO threadpool.
+        """
+        return await asyncio.wrap_future(self._submit(fn, args))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and lifetime counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / self._completed * 1000, 3) if self._completed else 0.0,
+            }
+
+password_pool = PasswordWorkPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify password against hash and rehash it if the hash settings changed
+
+    Returns:
+        (valid, new_hash) where new_hash is None unless the stored hash is outdated
+    """
+    return password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Get password hash"""
-    return pwd_context.hash(password)
+    return password_pool.run(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """`verify_and_update_password` for async endpoints"""
+    return await password_pool.run_async(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """`get_password_hash` for async endpoints"""
+    return await password_pool.run_async(pwd_context.hash, password)
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
@@ -51,9 +244,20 @@ def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Dep
     except jwt.JWTError:
         raise credentials_exception
     
-    user = session.exec(select(User).where(User.email == email)).first()
-    if user is None:
-        raise credentials_exception
+    cached = user_cache.get(email)
+    if cached is not None:
+        # Attach the cached row to this session without querying it again
+        user = session.identity_map.get(session.identity_key(User, cached["id"]))
+        if user is None:
+            user = User(**cached)
+            make_transient_to_detached(user)
+            session.add(user)
+    else:
+        generation = user_cache.generation(email)
+        user = session.exec(select(User).where(User.email == email)).first()
+        if user is None:
+            raise credentials_exception
+        user_cache.set(email, user, generation)
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
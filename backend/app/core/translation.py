@@ -1,6 +1,8 @@
 # backend/app/core/translation.py
 from typing import Dict, Any, Optional
 
+from sqlalchemy import func
+
 class TranslationService:
     """Service for handling translations"""
     
@@ -72,23 +74,57 @@ class TranslationService:
         
         return result
     
+    @staticmethod
+    def _lookup(default_value: Optional[str], translations: Optional[Dict[str, str]], language: str) -> Optional[str]:
+        """Translation of a field if a non-empty one exists for the language, else the default value"""
+        if translations and translations.get(language):
+            return translations[language]
+        return default_value
+
     @classmethod
-    def apply_translations_to_model(cls, model_instance, language: str):
+    def translated_column(cls, default_column, translations_column, language: str):
         """
-        Apply translations to a SQLModel instance
+        SQL expression selecting a field in the requested language
+        
+        Resolves the translation in the database with the same fallback
+        rules as `_lookup`, so only the chosen value is read instead of the
+        whole translations JSON. The JSON lookup compiles to `->>` on
+        PostgreSQL and JSON_EXTRACT on SQLite.
         
         Args:
-            model_instance: SQLModel instance (Product or Category)
+            default_column: Column holding the default value (e.g. Product.name)
+            translations_column: JSON column of translations (e.g. Product.name_translations)
+            language: Requested language code
+        """
+        if language not in cls.SUPPORTED_LANGUAGES:
+            return default_column
+        return func.coalesce(
+            func.nullif(translations_column[language].as_string(), ''),
+            default_column,
+        )
+
+    @classmethod
+    def translate_read_model(cls, read_model, language: str):
+        """
+        Return a translated copy of a read model (ProductRead or CategoryRead)
+
+        Empty translations fall back to the default value (see `_lookup`);
+        the original object is returned as-is when nothing needs translating.
+
+        Args:
+            read_model: Pydantic read model with *_translations fields
             language: Target language
         """
-        # Update name if translations exist
-        if hasattr(model_instance, 'get_translated_name'):
-            model_instance.name = model_instance.get_translated_name(language)
-            
-        # Update description if translations exist
-        if hasattr(model_instance, 'get_translated_description'):
-            translated_desc = model_instance.get_translated_description(language)
-            if translated_desc is not None:
-                model_instance.description = translated_desc
-        
-        return model_instance
\ No newline at end of file
+        update = {}
+
+        name = cls._lookup(read_model.name, read_model.name_translations, language)
+        if name != read_model.name:
+            update['name'] = name
+
+        description = cls._lookup(read_model.description, read_model.description_translations, language)
+        if description != read_model.description:
+            update['description'] = description
+
+        if not update:
+            return read_model
+        return read_model.model_copy(update=update)
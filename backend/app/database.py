@@ -1,18 +1,398 @@
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 
-# Create SQLite engine
+class PoolStats:
+    """Lifetime checkout counters of a connection pool (or the SQLite writer queue)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+pool_stats = PoolStats()
+# Waits for the SQLite writer queue, kept apart from statement timings
+sqlite_write_queue_stats = PoolStats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+logger = logging.getLogger(__name__)
+
+# Statements that need SQLite's write lock
+_SQLITE_WRITE_STATEMENT = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+class SQLiteWriteQueue:
+    """
+    Process-wide queue for SQLite write transactions
+
+    SQLite allows a single writer at a time; concurrent writers otherwise
+    fail with "database is locked" once busy_timeout runs out. A connection
+    takes this lock before its first write statement and releases it when
+    the transaction commits or rolls back, so writers from this process
+    wait their turn here while readers keep using the pool freely.
+    """
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._lock = threading.Lock()
+
+    def acquire(self, connection) -> None:
+        if connection.info.get("sqlite_write_lock"):
+            return
+        started = time.perf_counter()
+        if self._lock.acquire(timeout=self.timeout_seconds):
+            sqlite_write_queue_stats.record(time.perf_counter() - started)
+            connection.info["sqlite_write_lock"] = True
+        else:
+            sqlite_write_queue_stats.record(time.perf_counter() - started, timed_out=True)
+            # Let SQLite's own busy handling have the final say
+            logger.warning("Timed out waiting for the SQLite writer queue")
+
+    def release(self, connection) -> None:
+        if connection.info.pop("sqlite_write_lock", False):
+            self._lock.release()
+
+class QueryStats:
+    """SQL statements executed, and the time spent on them, by one request"""
+
+    __slots__ = ("label", "count", "seconds", "statements")
+
+    def __init__(self, label: str = "", record_statements: bool = False):
+        # Shown in slow query logs, e.g. "GET /api/v1/products"
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+# Stats of the request being handled. Sync endpoints run on worker threads
+# that inherit the request's context, so they update the same object.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+@contextmanager
+def track_queries(label: str = "", record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the statements executed in this context (and threads started from it)"""
+    stats = QueryStats(label, record_statements)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+def _redact(parameters: Any) -> Any:
+    """Replace bound parameter values with their type names (they may hold personal data)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: one parameter set per row
+            return f"{len(parameters)} rows of {_redact(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return parameters
+
+def _instrument_queries(target_engine: Engine) -> None:
+    """
+    Time every statement and add it to the current request's QueryStats
+
+    Statements slower than SLOW_QUERY_MS are logged with their parameters
+    redacted.
+    """
+    slow_query_seconds = settings.SLOW_QUERY_MS / 1000
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+            if stats.statements is not None:
+                stats.statements.append(statement)
+
+        if slow_query_seconds and elapsed >= slow_query_seconds:
+            source = f" in {stats.label}" if stats is not None and stats.label else ""
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms){source}: {statement} "
+                f"| parameters: {_redact(parameters)}"
+            )
+
+    @event.listens_for(target_engine, "handle_error")
+    def discard_query_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+def _configure_sqlite(sqlite_engine: Engine, serialize_writes: bool = True) -> None:
+    """Apply the SQLite performance profile to every new connection"""
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if settings.SQLITE_WAL:
+            # Readers no longer block the writer (and vice versa)
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.close()
+
+    if not (serialize_writes and settings.SQLITE_SERIALIZE_WRITES):
+        return
+
+    write_queue = SQLiteWriteQueue(settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+
+    @event.listens_for(sqlite_engine, "before_cursor_execute")
+    def queue_writes(conn, cursor, statement, parameters, context, executemany):
+        if _SQLITE_WRITE_STATEMENT.match(statement):
+            write_queue.acquire(conn)
+
+    @event.listens_for(sqlite_engine, "commit")
+    def release_after_commit(conn):
+        write_queue.release(conn)
+
+    @event.listens_for(sqlite_engine, "rollback")
+    def release_after_rollback(conn):
+        write_queue.release(conn)
+
+    @event.listens_for(sqlite_engine.pool, "checkin")
+    def release_on_checkin(dbapi_connection, connection_record):
+        # Safety net for connections returned without commit or rollback
+        if connection_record is not None:
+            write_queue.release(connection_record)
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Engine keyword arguments for the database backend in use
+
+    SQLite gets a reader pool usable across threads; server databases get
+    a sized, instrumented pool plus server-side session settings.
+    """
+    url = make_url(database_url)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+
+    if backend == "sqlite":
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if url.database and url.database != ":memory:":
+            options.update({
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+            })
+        return options
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    if backend == "postgresql":
+        connect_args: Dict[str, Any] = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        if driver == "psycopg":
+            # Server-side prepared statements (psycopg2 has none)
+            if not settings.DB_PREPARED_STATEMENTS:
+                connect_args["prepare_threshold"] = None
+            elif settings.DB_PREPARE_THRESHOLD is not None:
+                connect_args["prepare_threshold"] = settings.DB_PREPARE_THRESHOLD
+        options["connect_args"] = connect_args
+
+    return options
+
+# Create database engine
 engine = create_engine(
-    settings.DATABASE_URL, 
-    echo=False,  # Set to True for debugging
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **_engine_options(settings.DATABASE_URL)
+)
+
+# Registered after the SQLite writer queue, so statement timings start once
+# the write lock is held (the queue wait is counted in sqlite_write_queue_stats)
+if engine.dialect.name == "sqlite":
+    _configure_sqlite(engine)
+_instrument_queries(engine)
+
+# asyncio drivers used by the async engine for each backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def _async_database_url(database_url: str) -> URL:
+    """Swap the driver of a database URL for its asyncio counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+def _async_engine_options(url: URL) -> Dict[str, Any]:
+    """Engine keyword arguments for the async engine"""
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_driver_name() == "asyncpg":
+        connect_args: Dict[str, Any] = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        if not settings.DB_PREPARED_STATEMENTS:
+            # asyncpg's own statement cache and SQLAlchemy's cache on top of it
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+        options["connect_args"] = connect_args
+    return options
+
+# Async engine for the read-only catalog endpoints; writes keep using `engine`
+async_database_url = (
+    make_url(settings.ASYNC_DATABASE_URL) if settings.ASYNC_DATABASE_URL
+    else _async_database_url(settings.DATABASE_URL)
+)
+async_engine = create_async_engine(
+    async_database_url,
+    echo=settings.DB_ECHO,
+    **_async_engine_options(async_database_url)
 )
 
+if async_engine.dialect.name == "sqlite":
+    _configure_sqlite(async_engine.sync_engine, serialize_writes=False)
+_instrument_queries(async_engine.sync_engine)
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Current pool occupancy and checkout wait statistics"""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool_stats.snapshot())
+
+    if engine.dialect.name == "sqlite" and settings.SQLITE_SERIALIZE_WRITES:
+        stats["sqlite_write_queue"] = sqlite_write_queue_stats.snapshot()
+
+    return stats
+
+# Alembic setup (backend/alembic.ini and backend/migrations)
+ALEMBIC_CONFIG = Path(__file__).resolve().parent.parent / "alembic.ini"
+# Revision matching the schema create_all produced before migrations existed
+INITIAL_REVISION = "0001"
+
 def create_db_and_tables():
-    """Create database tables if they don't exist"""
+    """
+    Create database tables and indexes if they don't exist
+
+    Only used to bring databases created before migrations up to the
+    initial revision; use run_migrations for everything else.
+    """
     SQLModel.metadata.create_all(engine)
 
+    # create_all skips tables that already exist, so add any index declared
+    # on the models since those tables were created
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+def run_migrations(revision: str = "head") -> None:
+    """Upgrade the database schema with the Alembic migrations"""
+    # Imported here so serving the API doesn't load Alembic
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_CONFIG))
+    config.attributes["configure_logger"] = False
+
+    tables = inspect(engine).get_table_names()
+    if tables and "alembic_version" not in tables:
+        # Database created with create_all: complete it to the initial
+        # revision and record that, then migrate as usual
+        logger.info(f"Stamping existing database with revision {INITIAL_REVISION}")
+        create_db_and_tables()
+        command.stamp(config, INITIAL_REVISION)
+
+    command.upgrade(config, revision)
+
+def schema_revisions() -> Tuple[Optional[str], Optional[str]]:
+    """Revision the database schema is at (None if never migrated) and the newest migration"""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory.from_config(Config(str(ALEMBIC_CONFIG))).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    return current, head
+
 def get_session():
     """Create a new database session"""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    """Create a new async database session (read endpoints)"""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
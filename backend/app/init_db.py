@@ -0,0 +1,49 @@
+# backend/app/init_db.py
+"""
+One-shot database initialisation
+
+Runs the schema migrations, creates the admin user, seeds the sample
+catalog and builds the derived data (search index, sales rollups). Run it
+once per deployment, before starting the API workers:
+
+    python -m app.init_db
+"""
+import argparse
+import logging
+
+from sqlmodel import Session
+
+from app.core.admin import create_admin_user
+from app.core.rollups import sales_rollups
+from app.core.search import product_search
+from app.database import engine, run_migrations
+# Register every table so relationships can be resolved
+from app.models import category, order, product, sales_rollup, user  # noqa: F401
+from app.seed_data import seed_data
+
+logger = logging.getLogger(__name__)
+
+def init_db(seed: bool = True) -> None:
+    """Bring the database up to date and create the initial data"""
+    run_migrations()
+
+    with Session(engine) as session:
+        create_admin_user(session)
+
+    if seed:
+        seed_data()
+
+    with Session(engine) as session:
+        # Rebuilt in full, so index entries that went stale are repaired
+        product_search.rebuild(session)
+        # Backfill sales rollups
+        sales_rollups.ensure_rollups(session)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Initialise the database")
+    parser.add_argument("--no-seed", action="store_true", help="don't add the sample categories and products")
+    args = parser.parse_args()
+
+    init_db(seed=not args.no_seed)
@@ -3,6 +3,7 @@ from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from datetime import datetime, timezone
 from enum import Enum
 from pydantic import field_validator
+from sqlalchemy import Index
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -26,6 +27,10 @@ class OrderItemBase(SQLModel):
 class OrderItem(OrderItemBase, table=True):
     """Database model for order items"""
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_product_id", "product_id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     product_name: str
     product_unit: str
@@ -45,6 +50,11 @@ class OrderBase(SQLModel):
 class Order(OrderBase, table=True):
     """Database model for orders"""
     __tablename__ = "orders"
+    __table_args__ = (
+        # Newest-first order listings, per customer and overall
+        Index("ix_orders_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_orders_created_at", "created_at", "id"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = Field(default=None)
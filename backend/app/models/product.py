@@ -2,6 +2,7 @@ from sqlmodel import SQLModel, Field, Relationship, JSON, Column
 from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from datetime import datetime, timezone
 from enum import Enum
+from sqlalchemy import Index, text
 
 if TYPE_CHECKING:
     from app.models.category import Category
@@ -49,6 +50,15 @@ class ProductBase(SQLModel):
 class Product(ProductBase, table=True):
     """Database model for products"""
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_category_id", "category_id"),
+        # Low stock lookups only ever look at active products
+        Index(
+            "ix_products_active_stock", "stock_quantity",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active = true"),
+        ),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = Field(default=None)
@@ -0,0 +1,28 @@
+from sqlmodel import SQLModel, Field
+from datetime import date
+
+from app.models.order import OrderStatus
+
+class DailyOrderSales(SQLModel, table=True):
+    """Orders and revenue per day and order status"""
+    __tablename__ = "daily_order_sales"
+    day: date = Field(primary_key=True)
+    status: OrderStatus = Field(primary_key=True)
+    order_count: int = Field(default=0)
+    revenue: float = Field(default=0)
+
+class DailyProductSales(SQLModel, table=True):
+    """Quantity and revenue per day and product (cancelled orders excluded)"""
+    __tablename__ = "daily_product_sales"
+    day: date = Field(primary_key=True)
+    product_id: int = Field(primary_key=True, foreign_key="products.id")
+    quantity: float = Field(default=0)
+    revenue: float = Field(default=0)
+
+class DailyCategorySales(SQLModel, table=True):
+    """Quantity and revenue per day and category (cancelled orders excluded)"""
+    __tablename__ = "daily_category_sales"
+    day: date = Field(primary_key=True)
+    category_id: int = Field(primary_key=True, foreign_key="categories.id")
+    quantity: float = Field(default=0)
+    revenue: float = Field(default=0)
@@ -1,9 +1,9 @@
 # backend/app/seed_data.py
 import logging
-from sqlmodel import Session, select
+from sqlmodel import Session
+from app.catalog_import import import_categories, import_products, numbered
 from app.database import engine
-from app.models.category import Category
-from app.models.product import Product, ProductUnit
+from app.models.product import ProductUnit
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -320,46 +320,11 @@ def seed_data():
     logger.info("Starting database seeding with translations...")
     
     with Session(engine) as session:
-        # Seed categories
-        for category_data in CATEGORIES:
-            # Check if category already exists
-            category = session.exec(
-                select(Category).where(Category.name == category_data["name"])
-            ).first()
-            
-            if not category:
-                category = Category(**category_data)
-                session.add(category)
-                logger.info(f"Added category: {category_data['name']}")
-        
-        # Commit categories first to ensure they exist before adding products
-        session.commit()
-        
-        # Seed products
-        for product_data in PRODUCTS:
-            # Get category ID
-            category_name = product_data.pop("category_name")
-            category = session.exec(
-                select(Category).where(Category.name == category_name)
-            ).first()
-            
-            if not category:
-                logger.warning(f"Category '{category_name}' not found, skipping product: {product_data['name']}")
-                continue
-            
-            # Check if product already exists
-            product = session.exec(
-                select(Product).where(Product.name == product_data["name"])
-            ).first()
-            
-            if not product:
-                product = Product(**product_data, category_id=category.id)
-                session.add(product)
-                logger.info(f"Added product: {product_data['name']}")
-        
-        session.commit()
+        # Existing rows are left as they are, so edits made through the API survive re-seeding
+        import_categories(session, numbered(CATEGORIES), update_existing=False)
+        import_products(session, numbered(PRODUCTS), update_existing=False)
     
     logger.info("Database seeding with translations completed!")
 
 if __name__ == "__main__":
-    seed_data()
\ No newline at end of file
+    seed_data()
@@ -0,0 +1,70 @@
+# backend/app/testing.py
+"""
+Test helpers that put a budget on SQL statements, to catch N+1 patterns
+
+Direct calls (services, session code) are tracked in-process:
+
+    with assert_max_queries(3):
+        sales_rollups.record_order(session, order, lines)
+
+Endpoints are checked through the X-DB-Queries response header, since the
+test client runs the app on another thread:
+
+    assert_endpoint_max_queries(client, 6, "GET", "/api/v1/admin/dashboard", headers=auth)
+
+Hot queries are checked against full table scans on a migrated database:
+
+    assert_query_plans_use_indexes(session)
+"""
+import unittest
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlmodel import Session
+
+from app.core.query_plans import check_query_plans
+from app.database import QueryStats, track_queries
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """Fail if the block executes more than `max_queries` SQL statements"""
+    with track_queries(label="assert_max_queries", record_statements=True) as stats:
+        yield stats
+
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {number}. {statement}" for number, statement in enumerate(stats.statements, 1))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {stats.count} were executed:\n{statements}"
+        )
+
+
+def assert_endpoint_max_queries(client: Any, max_queries: int, method: str, url: str, **kwargs: Any) -> Any:
+    """
+    Call an endpoint with a test client and fail if it ran more than `max_queries` statements
+
+    Returns the response for further assertions. Needs DB_QUERY_HEADERS
+    (on by default).
+    """
+    response = client.request(method, url, **kwargs)
+    count = response.headers.get("X-DB-Queries")
+    if count is None:
+        raise AssertionError(f"{method} {url} has no X-DB-Queries header, is DB_QUERY_HEADERS disabled?")
+    if int(count) > max_queries:
+        raise AssertionError(f"{method} {url} ran {count} queries, expected at most {max_queries}")
+    return response
+
+
+def assert_query_plans_use_indexes(session: Session) -> None:
+    """
+    Fail if a hot query (app.core.query_plans.HOT_QUERIES) needs a full table scan
+
+    Skipped (unittest.SkipTest, which pytest honours too) on backends whose
+    query plans can't be checked.
+    """
+    problems = check_query_plans(session)
+    if problems is None:
+        raise unittest.SkipTest(f"Query plans can't be checked on {session.get_bind().dialect.name}")
+    if problems:
+        details = "\n".join(f"  {name}: {'; '.join(lines)}" for name, lines in problems.items())
+        raise AssertionError(f"Hot queries fall back to a full scan:\n{details}")
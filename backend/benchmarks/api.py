@@ -0,0 +1,307 @@
+"""
+Load benchmark for the API hot paths
+
+Drives the catalog, order and admin endpoints against a synthetic dataset
+(see benchmarks/dataset.py, seeded automatically when the database is
+empty) and prints latency percentiles and throughput per scenario as JSON,
+so runs can be compared across commits.
+
+Modes:
+
+  asgi   in-process: requests go straight to the ASGI app, no network or
+         server process (measures the application code)
+  http   starts gunicorn with --workers processes on --port and sends real
+         HTTP requests (measures the deployed process model); pass --url to
+         target a server that is already running instead
+
+Usage (from the backend directory):
+
+    python -m benchmarks.api --products 100000 --orders 1000000 --output before.json
+    python -m benchmarks.api --mode http --workers 4 --concurrency 32 --output after.json
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:
+    sys.exit("The API benchmark needs httpx: pip install httpx")
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+
+# (method, path, query params, JSON body, token name) of one request
+Request = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]
+
+
+def build_scenarios(size: Dict[str, int], customer_id: int) -> Dict[str, Callable[[random.Random], Request]]:
+    """Request generators per scenario, each drawing its parameters from an RNG"""
+    from benchmarks.dataset import ADJECTIVES, NOUNS
+
+    products = max(size["products"], 1)
+    categories = max(size["categories"], 1)
+    orders = max(size["orders"], 1)
+
+    return {
+        "products_list": lambda rng: (
+            "GET", "/api/v1/products", {"limit": 100, "skip": rng.randrange(0, max(products - 100, 1))}, None, None
+        ),
+        "products_search": lambda rng: (
+            "GET", "/api/v1/products",
+            {"search": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}", "limit": 50, "sort_by": "relevance"},
+            None, None,
+        ),
+        "products_filter_sort": lambda rng: (
+            "GET", "/api/v1/products",
+            {
+                "category_id": rng.randint(1, categories), "is_organic": "true",
+                "sort_by": "price", "sort_order": "desc", "limit": 100, "lang": "fr",
+            },
+            None, None,
+        ),
+        "create_order": lambda rng: (
+            "POST", "/api/v1/orders", None,
+            {
+                "user_id": customer_id,
+                "shipping_address": "1 Market Street",
+                "contact_phone": "+1 555 0100",
+                "items": [
+                    {"product_id": rng.randint(1, products), "quantity": 1} for _ in range(rng.randint(1, 3))
+                ],
+            },
+            "customer",
+        ),
+        "read_order": lambda rng: ("GET", f"/api/v1/orders/{rng.randint(1, orders)}", None, None, "admin"),
+        "dashboard": lambda rng: ("GET", "/api/v1/admin/dashboard", None, None, "admin"),
+        "sales_report": lambda rng: (
+            "GET", "/api/v1/admin/sales-report",
+            {"period": rng.choice(["daily", "weekly", "monthly"]), "breakdown": "category"},
+            None, "admin",
+        ),
+    }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: Callable[[random.Random], Request],
+    tokens: Dict[str, str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Send `requests` requests with `concurrency` in flight and summarise the latencies"""
+    rng = random.Random(seed)
+    planned = [make_request(rng) for _ in range(warmup + requests)]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def send(request: Request, record: bool) -> None:
+        method, path, params, body, token = request
+        headers = {"Authorization": f"Bearer {tokens[token]}"} if token else None
+        started = time.perf_counter()
+        response = await client.request(method, path, params=params, json=body, headers=headers)
+        elapsed = time.perf_counter() - started
+        if not record:
+            return
+        latencies.append(elapsed)
+        # Out of stock (400) and inactive products are part of the workload
+        if response.status_code >= 500 or response.status_code in (401, 403, 404, 422, 429):
+            errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    for request in planned[:warmup]:
+        await send(request, record=False)
+
+    queue = iter(planned[warmup:])
+
+    async def worker() -> None:
+        for request in queue:
+            await send(request, record=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall_time, 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+    }
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_all(client: httpx.AsyncClient, args: argparse.Namespace, size: Dict[str, int]) -> Dict[str, Any]:
+    from app.core.config import settings
+    from benchmarks.dataset import CUSTOMER_PASSWORD
+
+    customer_id = 1
+    tokens = {
+        "admin": await login(client, settings.ADMIN_EMAIL, settings.ADMIN_PASSWORD),
+        "customer": await login(client, f"customer{customer_id}@example.com", CUSTOMER_PASSWORD),
+    }
+
+    scenarios = build_scenarios(size, customer_id)
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(sorted(unknown))} (available: {', '.join(scenarios)})")
+
+    results = {}
+    for name in selected:
+        print(f"Running {name}...", file=sys.stderr, flush=True)
+        results[name] = await run_scenario(
+            client, scenarios[name], tokens, args.requests, args.concurrency, args.warmup, args.seed
+        )
+    return results
+
+
+def wait_for_server(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.5)
+    sys.exit(f"Server at {url} did not come up within {timeout:.0f}s")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"\n  {'scenario':<22} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}", file=sys.stderr)
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"  {name:<22} {result['throughput_rps']:>9.1f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} "
+            f"{latency['p99']:>9.2f} {sum(result['errors'].values()):>7}",
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths")
+    parser.add_argument("--mode", choices=["asgi", "http"], default="asgi")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--categories", type=int, default=50, help="dataset size when seeding")
+    parser.add_argument("--products", type=int, default=10000, help="dataset size when seeding")
+    parser.add_argument("--customers", type=int, default=1000, help="dataset size when seeding")
+    parser.add_argument("--orders", type=int, default=100000, help="dataset size when seeding")
+    parser.add_argument("--scenarios", help="comma-separated scenarios to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="gunicorn workers (http mode)")
+    parser.add_argument("--port", type=int, default=8099, help="gunicorn port (http mode)")
+    parser.add_argument("--url", help="benchmark a running server instead of starting one (http mode)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and requests")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # The app reads its settings at import time
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlmodel import Session, select
+
+    from app.database import engine, run_migrations
+    from app.models.product import Product
+    from benchmarks import dataset
+
+    run_migrations()
+    with Session(engine) as session:
+        if session.exec(select(Product.id).limit(1)).first() is None:
+            print("Seeding the benchmark dataset...", file=sys.stderr, flush=True)
+            dataset.seed(session, args.categories, args.products, args.customers, args.orders, args.seed)
+        size = dataset.dataset_size(session)
+    engine.dispose()
+
+    server = None
+    if args.mode == "asgi":
+        from main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60)
+        workers = 1
+    else:
+        url = args.url or f"http://127.0.0.1:{args.port}"
+        if not args.url:
+            env = {
+                **os.environ,
+                "PORT": str(args.port),
+                "WEB_CONCURRENCY": str(args.workers),
+                "RUN_INIT_DB": "false",
+                "GUNICORN_ACCESS_LOG": "/dev/null",
+            }
+            server = subprocess.Popen(["gunicorn", "main:app", "-c", "gunicorn.conf.py"], env=env)
+            wait_for_server(url)
+        client = httpx.AsyncClient(
+            base_url=url, timeout=60, limits=httpx.Limits(max_connections=args.concurrency)
+        )
+        workers = None if args.url else args.workers
+
+    try:
+        results = asyncio.run(run_all(client, args, size))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "mode": args.mode,
+        "workers": workers,
+        "concurrency": args.concurrency,
+        "dataset": size,
+        "scenarios": results,
+    }
+    print_table(results)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Synthetic dataset for the API benchmarks
+
+Fills an empty database with categories, products, customers and an order
+history of configurable size using bulk inserts, then builds the search
+index and sales rollups. Generation is seeded, so the same arguments give
+the same data. The database is chosen with DATABASE_URL:
+
+    DATABASE_URL=sqlite:///./benchmark.db python -m benchmarks.dataset --products 100000 --orders 1000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import insert, text
+from sqlmodel import Session, func, select
+
+from app.core.admin import create_admin_user
+from app.core.rollups import sales_rollups
+from app.core.search import product_search
+from app.core.security import get_password_hash
+from app.database import engine, run_migrations
+from app.models.category import Category
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product, ProductUnit
+from app.models.user import User, UserRole
+
+# Password of every synthetic customer (customer1@example.com, ...)
+CUSTOMER_PASSWORD = "benchmark123"
+CHUNK_SIZE = 10000
+HISTORY_DAYS = 730
+
+NOUNS = [
+    "apple", "banana", "orange", "strawberry", "grape", "mango", "pear", "peach", "cherry", "plum",
+    "lemon", "lime", "kiwi", "melon", "carrot", "potato", "tomato", "onion", "garlic", "pepper",
+    "lettuce", "spinach", "broccoli", "cabbage", "cucumber", "zucchini", "eggplant", "pumpkin", "leek", "celery",
+]
+ADJECTIVES = ["fresh", "organic", "red", "green", "sweet", "local", "baby", "heirloom", "wild", "golden"]
+FRENCH = {"fresh": "frais", "organic": "bio", "sweet": "doux", "local": "local", "wild": "sauvage"}
+
+# Share of orders in each status
+STATUS_WEIGHTS = {
+    OrderStatus.DELIVERED: 70,
+    OrderStatus.SHIPPED: 10,
+    OrderStatus.CONFIRMED: 8,
+    OrderStatus.PENDING: 7,
+    OrderStatus.CANCELLED: 5,
+}
+
+
+def _chunks(count: int):
+    for start in range(0, count, CHUNK_SIZE):
+        yield range(start + 1, min(start + CHUNK_SIZE, count) + 1)
+
+
+def dataset_size(session: Session) -> Dict[str, int]:
+    """Row counts of the benchmarked tables"""
+    return {
+        "categories": session.exec(select(func.count()).select_from(Category)).one(),
+        "products": session.exec(select(func.count()).select_from(Product)).one(),
+        "customers": session.exec(
+            select(func.count()).select_from(User).where(User.role == UserRole.CUSTOMER)
+        ).one(),
+        "orders": session.exec(select(func.count()).select_from(Order)).one(),
+        "order_items": session.exec(select(func.count()).select_from(OrderItem)).one(),
+    }
+
+
+def seed(
+    session: Session,
+    categories: int = 50,
+    products: int = 10000,
+    customers: int = 1000,
+    orders: int = 100000,
+    seed: int = 42,
+) -> None:
+    """Fill an empty database with a synthetic catalog and order history"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    units = list(ProductUnit)
+
+    session.execute(insert(Category), [
+        {
+            "id": category_id,
+            "name": f"Category {category_id}",
+            "description": f"Synthetic category {category_id}",
+            "name_translations": {"fr": f"Catégorie {category_id}"},
+            "description_translations": {},
+            "is_active": True,
+            "created_at": now - timedelta(days=HISTORY_DAYS),
+        }
+        for category_id in range(1, categories + 1)
+    ])
+
+    # (price, name, unit) of each product, to build order lines
+    catalog: List[Tuple[float, str, str]] = [(0.0, "", "")]
+    for chunk in _chunks(products):
+        rows = []
+        for product_id in chunk:
+            adjective, noun = rng.choice(ADJECTIVES), rng.choice(NOUNS)
+            name = f"{adjective.title()} {noun} {product_id}"
+            price = round(rng.uniform(0.5, 25), 2)
+            unit = rng.choice(units)
+            catalog.append((price, name, unit.value))
+            rows.append({
+                "id": product_id,
+                "name": name,
+                "description": f"{adjective} {noun}, grown for the benchmark",
+                "name_translations": {"fr": f"{noun} {FRENCH.get(adjective, adjective)} {product_id}"},
+                "description_translations": {},
+                "price": price,
+                "unit": unit,
+                # Enough stock that the order benchmark never runs out
+                "stock_quantity": rng.randint(1_000_000, 2_000_000) if rng.random() > 0.02 else rng.randint(0, 10),
+                "is_organic": adjective == "organic" or rng.random() < 0.2,
+                "is_active": rng.random() > 0.05,
+                "category_id": rng.randint(1, categories),
+                "created_at": now - timedelta(days=rng.uniform(0, HISTORY_DAYS)),
+            })
+        session.execute(insert(Product), rows)
+
+    hashed_password = get_password_hash(CUSTOMER_PASSWORD)
+    for chunk in _chunks(customers):
+        session.execute(insert(User), [
+            {
+                "id": user_id,
+                "email": f"customer{user_id}@example.com",
+                "full_name": f"Customer {user_id}",
+                "address": f"{user_id} Market Street",
+                "role": UserRole.CUSTOMER,
+                "is_active": True,
+                "hashed_password": hashed_password,
+                "created_at": now - timedelta(days=HISTORY_DAYS),
+            }
+            for user_id in chunk
+        ])
+    session.commit()
+
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    item_id = 0
+    started = time.perf_counter()
+    for chunk in _chunks(orders):
+        order_rows, item_rows = [], []
+        for order_id in chunk:
+            total = 0.0
+            for product_id in rng.sample(range(1, products + 1), rng.randint(1, min(5, products))):
+                price, name, unit = catalog[product_id]
+                quantity = rng.randint(1, 3)
+                total += price * quantity
+                item_id += 1
+                item_rows.append({
+                    "id": item_id,
+                    "order_id": order_id,
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_price": price,
+                    "product_name": name,
+                    "product_unit": unit,
+                })
+            order_rows.append({
+                "id": order_id,
+                "user_id": rng.randint(1, customers),
+                "status": rng.choices(statuses, weights)[0],
+                "shipping_address": f"{order_id} Market Street",
+                "contact_phone": "+1 555 0100",
+                "total_amount": round(total, 2),
+                "created_at": now - timedelta(days=rng.uniform(0, HISTORY_DAYS)),
+            })
+        session.execute(insert(Order), order_rows)
+        session.execute(insert(OrderItem), item_rows)
+        session.commit()
+        print(f"  {chunk.stop - 1} orders, {(chunk.stop - 1) / (time.perf_counter() - started):,.0f} orders/s", flush=True)
+
+    if session.get_bind().dialect.name == "postgresql":
+        # Rows were inserted with explicit IDs, so move the sequences past them
+        for table in ("categories", "products", "users", "orders", "order_items"):
+            session.exec(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 1)) FROM {table}"
+            ))
+        session.commit()
+
+    create_admin_user(session)
+    product_search.rebuild(session)
+    sales_rollups.rebuild(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset for the API benchmarks")
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    args = parser.parse_args()
+
+    run_migrations()
+    with Session(engine) as session:
+        if session.exec(select(Product.id).limit(1)).first() is not None:
+            parser.error("the database already has products, point DATABASE_URL at an empty database")
+        seed(session, args.categories, args.products, args.customers, args.orders, args.seed)
+        print(dataset_size(session))
+
+
+if __name__ == "__main__":
+    # Register the remaining models so every relationship can be resolved
+    from app.models import sales_rollup  # noqa: F401
+
+    main()
@@ -0,0 +1,152 @@
+"""
+Serialization benchmark for the largest list responses
+
+Compares the ways a list endpoint can turn validated read models into a
+response body:
+
+  json        JSONResponse: dump to Python objects, then json.dumps
+  orjson      ORJSONResponse: dump to Python objects, then orjson.dumps
+  dump_json   FastAPI's default when a response_model is set: pydantic-core
+              writes JSON bytes directly
+  prerendered Catalog cache: rows rendered once, joined per request
+
+Usage (from the backend directory):
+
+    python -m benchmarks.serialization --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.models.order import OrderRead, OrderStatus
+from app.models.product import ProductRead, ProductUnit
+from app.models.user import UserRead, UserRole
+
+try:
+    import orjson
+except ImportError:  # optional, only needed for the orjson column
+    orjson = None
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_products(count: int) -> List[ProductRead]:
+    units = list(ProductUnit)
+    return [
+        ProductRead(
+            id=i,
+            name=f"Product {i}",
+            description="Fresh from the farm " * 4,
+            name_translations={"fr": f"Produit {i}", "ar": f"منتج {i}"},
+            description_translations={"fr": "Frais de la ferme " * 4, "ar": "طازج من المزرعة " * 4},
+            price=1.5 + i % 50,
+            unit=units[i % len(units)],
+            stock_quantity=i % 200,
+            image_url=f"https://example.com/images/{i}.jpg",
+            is_organic=i % 2 == 0,
+            is_active=True,
+            category_id=1 + i % 5,
+            created_at=NOW + timedelta(minutes=i),
+            updated_at=None if i % 3 else NOW + timedelta(days=1, minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_orders(count: int) -> List[OrderRead]:
+    statuses = list(OrderStatus)
+    return [
+        OrderRead(
+            id=i,
+            user_id=1 + i % 100,
+            status=statuses[i % len(statuses)],
+            shipping_address=f"{i} Market Street",
+            contact_phone="+1 555 0100",
+            total_amount=12.5 + i,
+            created_at=NOW + timedelta(minutes=i),
+            updated_at=None if i % 3 else NOW + timedelta(days=1, minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_users(count: int) -> List[UserRead]:
+    roles = list(UserRole)
+    return [
+        UserRead(
+            id=i,
+            email=f"user{i}@example.com",
+            full_name=f"User {i}",
+            phone="+1 555 0100",
+            address=f"{i} Market Street",
+            role=roles[i % len(roles)],
+            created_at=NOW + timedelta(minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def encoders(adapter: TypeAdapter, rows: List[Any]) -> Dict[str, Callable[[], bytes]]:
+    """Build one zero-argument callable per serialization strategy"""
+    cases: Dict[str, Callable[[], bytes]] = {
+        # Same settings as starlette's JSONResponse.render
+        "json": lambda: json.dumps(
+            adapter.dump_python(rows, mode="json"),
+            ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+        ).encode("utf-8"),
+        "dump_json": lambda: adapter.dump_json(rows),
+    }
+    if orjson is not None:
+        cases["orjson"] = lambda: orjson.dumps(
+            adapter.dump_python(rows, mode="json"), option=orjson.OPT_NON_STR_KEYS
+        )
+    if rows and isinstance(rows[0], ProductRead):
+        rendered = [row.model_dump_json().encode() for row in rows]
+        cases["prerendered"] = lambda: b"[" + b",".join(rendered) + b"]"
+    return cases
+
+
+def bench(name: str, model: Any, rows: List[Any], repeat: int) -> None:
+    adapter = TypeAdapter(List[model])
+    cases = encoders(adapter, rows)
+
+    # Every strategy must produce the same document
+    expected = json.loads(cases["json"]())
+    for case, encode in cases.items():
+        assert json.loads(encode()) == expected, f"{case} output differs"
+
+    size = len(cases["dump_json"]())
+    print(f"\n{name}: {len(rows)} rows, {size / 1024:.0f} KiB per response")
+    print(f"  {'strategy':<12} {'ms/response':>12} {'responses/s':>12} {'speedup':>8}")
+
+    baseline = None
+    for case, encode in cases.items():
+        encode()  # warm up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            encode()
+        per_call = (time.perf_counter() - started) / repeat
+        baseline = baseline or per_call
+        print(f"  {case:<12} {per_call * 1000:>12.3f} {1 / per_call:>12.0f} {baseline / per_call:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of list responses")
+    parser.add_argument("--rows", type=int, default=1000, help="rows per response (max page size is 1000)")
+    parser.add_argument("--repeat", type=int, default=200, help="responses encoded per strategy")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed, skipping the orjson strategy")
+
+    bench("GET /products", ProductRead, make_products(args.rows), args.repeat)
+    bench("GET /orders", OrderRead, make_orders(args.rows), args.repeat)
+    bench("GET /users", UserRead, make_users(args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# backend/gunicorn.conf.py
+"""
+Production server configuration
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Runs one uvicorn worker process per CPU (uvloop and httptools are picked
+up automatically when installed). The app is imported once in the master
+and forked into the workers, which are recycled after a bounded number of
+requests. Every setting can be overridden with the environment variables
+below or on the gunicorn command line.
+"""
+import os
+import subprocess
+import sys
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+# Async workers are not blocked by I/O, so one per core keeps every core busy
+workers = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once before forking: workers share its memory pages and
+# start faster
+preload_app = True
+
+# Restart each worker after this many requests (with jitter so they don't
+# all restart at once) to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Seconds a worker may go silent before it is killed and replaced, and
+# seconds in-flight requests get to finish on restart or shutdown
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    """Migrate and seed the database once, before any worker is forked"""
+    if os.getenv("RUN_INIT_DB", "true").lower() != "true":
+        return
+
+    # A separate process, so the master opens no database connections and
+    # starts no threads (e.g. the password pool) that forked workers would
+    # inherit in a broken state
+    server.log.info("Initialising the database")
+    subprocess.run([sys.executable, "-m", "app.init_db"], check=True)
@@ -1,16 +1,30 @@
-from fastapi import FastAPI, Depends, Request
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+import logging
+import secrets
 import uvicorn
-from sqlmodel import Session
 import time
 
-from app.database import create_db_and_tables, engine
+from app.database import async_engine, track_queries
 from app.api.api_v1.api import api_router
 from app.core.config import settings
-from app.core.admin import create_admin_user
-from app.seed_data import seed_data
+from app.core.metrics import (
+    metrics,
+    route_template,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_request_db_queries,
+    http_request_db_seconds,
+)
+
+logger = logging.getLogger(__name__)
 
+# No default_response_class: every route declares a response_model, so
+# FastAPI has pydantic-core write the JSON bytes directly. A custom class such
+# as ORJSONResponse turns that path off and is slower (see
+# benchmarks/serialization.py).
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API for an e-commerce platform selling fruits and vegetables",
@@ -31,31 +45,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "ETag", "Last-Modified", "X-DB-Queries", "X-DB-Time", "X-Profile-Id", "X-Profiled-Status"],
 )
 
-# Add middleware for request timing
+# Add middleware for request timing and metrics
 @app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+async def record_request_metrics(request: Request, call_next):
+    method = request.method
+    http_requests_in_progress.inc(method=method)
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        with track_queries(label=f"{method} {request.url.path}") as query_stats:
+            response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        process_time = time.perf_counter() - start_time
+        http_requests_in_progress.dec(method=method)
+        
+        # Label by route template so /products/1 and /products/2 share a series
+        route = request.scope.get("route")
+        route = route_template(app.routes, route) if route is not None else "unmatched"
+        http_requests_total.inc(method=method, route=route, status=str(status_code))
+        http_request_duration_seconds.observe(process_time, method=method, route=route)
+        http_request_db_queries.observe(query_stats.count, method=method, route=route)
+        http_request_db_seconds.observe(query_stats.seconds, method=method, route=route)
+        
+        if settings.REQUEST_QUERY_WARN_COUNT and query_stats.count > settings.REQUEST_QUERY_WARN_COUNT:
+            logger.warning(
+                f"{query_stats.label} ran {query_stats.count} queries "
+                f"({query_stats.seconds * 1000:.1f} ms), possible N+1 pattern",
+                extra={"route": route, "db_queries": query_stats.count, "db_seconds": query_stats.seconds},
+            )
+    
     response.headers["X-Process-Time"] = str(process_time)
+    if settings.DB_QUERY_HEADERS:
+        response.headers["X-DB-Queries"] = str(query_stats.count)
+        response.headers["X-DB-Time"] = f"{query_stats.seconds * 1000:.3f}"
     return response
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-def on_startup():
-    """Create tables and initial data on startup"""
-    create_db_and_tables()
-    
-    # Create admin user
-    with Session(engine) as session:
-        create_admin_user(session)
-    
-    # Seed data
-    seed_data()
+# Schema, admin user and seed data are set up once per deployment with
+# `python -m app.init_db`; workers only connect and serve
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Close the async engine's pooled connections"""
+    await async_engine.dispose()
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus metrics of this worker process"""
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("authorization", "")
+        if not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/")
 def root():
@@ -63,4 +110,7 @@ def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME} API", "status": "online"}
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    from app.init_db import init_db
+    
+    init_db()
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=settings.RELOAD)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# backend/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+from sqlmodel import SQLModel
+
+from app.database import engine
+# Register every table on SQLModel.metadata
+from app.models import category, order, product, sales_rollup, user  # noqa: F401
+
+config = context.config
+
+# Only configure logging when run through the alembic CLI, not from init_db
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+# Tables created with raw SQL by the migrations, not part of the models
+# (full-text search index)
+UNMANAGED_TABLES = {"products_fts", "product_search"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and (name in UNMANAGED_TABLES or name.startswith("products_fts_")):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to the database"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=engine.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations against the application's database"""
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can only alter tables by recreating them
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
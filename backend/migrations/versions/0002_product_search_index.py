@@ -0,0 +1,56 @@
+"""product search index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 21:05:12.417305
+
+Full-text index over product names and descriptions in every language
+(app.core.search): an FTS5 table on SQLite and a tsvector table with a GIN
+index on PostgreSQL. Neither is part of the models, so they are created
+with raw SQL. The index is filled by `python -m app.init_db`.
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        if not bind.execute(sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar():
+            logger.warning("SQLite was built without FTS5, product search will use a plain scan")
+            return
+        # IF NOT EXISTS: databases from before this revision may already
+        # have the index
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts "
+            "USING fts5(name, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    elif bind.dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS product_search ("
+            "product_id INTEGER PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_product_search_document "
+            "ON product_search USING GIN (document)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS products_fts")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP TABLE IF EXISTS product_search")